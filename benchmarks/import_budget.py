@@ -0,0 +1,97 @@
+"""Cold-start budget for the Campus Care app.
+
+Renders the overview page once in a fresh interpreter with Streamlit's
+AppTest, against a throwaway SQLite database. It fails (exit status 1)
+when the app raises or shows an error, when the overview content did not
+render, when that takes longer than the budget, or when a heavy module
+that only the high-risk/dashboard pages need got imported on the way.
+
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --budget 1.5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only the pages that score or plot may load these
+DEFERRED_MODULES = ["pandas", "numpy", "sklearn", "scipy", "joblib", "plotly.graph_objects"]
+
+# A throwaway SQLite database, migrated by the app's startup schema check,
+# so the run goes past it and renders the whole page (SQLITE_PATH is added
+# per run)
+SECRETS = {
+    "STORAGE_BACKEND": "sqlite",
+    "AUTO_MIGRATE": True,
+}
+
+# Text only the overview page renders
+OVERVIEW_MARKER = "Campus Care</strong> is a student-centered wellbeing platform"
+
+
+def _measure():
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    # `streamlit run` puts the script's directory on sys.path; AppTest does not
+    sys.path.insert(0, ROOT)
+    # The test harness itself imports some of these; only count what the app adds
+    already_loaded = set(sys.modules)
+    with tempfile.TemporaryDirectory() as directory:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        for key, value in SECRETS.items():
+            at.secrets[key] = value
+        at.secrets["SQLITE_PATH"] = os.path.join(directory, "budget.sqlite3")
+        at.run()
+        elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "loaded": [name for name in DEFERRED_MODULES if name in sys.modules and name not in already_loaded],
+        "exception": [str(e.value) for e in at.exception],
+        "error": [str(e.value) for e in at.error],
+        "rendered": "views.overview" in sys.modules and any(OVERVIEW_MARKER in m.value for m in at.markdown),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds allowed for a cold overview render")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        os.chdir(ROOT)
+        print(json.dumps(_measure()))
+        return 0
+
+    # A fresh interpreter, so nothing is already in sys.modules
+    out = subprocess.run([sys.executable, __file__, "--measure"], capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"Cold overview render: {result['seconds']:.2f}s (budget {args.budget:.2f}s)")
+    failed = False
+    if result["exception"]:
+        print(f"App raised: {result['exception']}")
+        failed = True
+    if result["error"]:
+        print(f"App showed an error: {result['error']}")
+        failed = True
+    if not result["rendered"]:
+        print("The overview page was not rendered")
+        failed = True
+    if result["loaded"]:
+        print(f"Imported on the overview page: {', '.join(result['loaded'])}")
+        failed = True
+    if result["seconds"] > args.budget:
+        print("Over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
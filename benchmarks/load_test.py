@@ -0,0 +1,338 @@
+"""Load test: concurrent simulated students against a throwaway database.
+
+Drives app.py with Streamlit's AppTest through a whole student journey:
+sign up, log in, the seven-slider self-check, then either the high-risk
+intake and scoring or the three wellness modules, and finally the dashboard.
+Latency is reported per page step and per service helper.
+
+Each concurrent student is a worker process running journeys back to back:
+AppTest resets process-global state (the Runtime instance, st.secrets) after
+every run, so two runs cannot overlap in one interpreter. The numbers
+therefore cover database, bcrypt and scoring contention across sessions, not
+Streamlit's own thread scheduling. Every worker first runs two untimed
+journeys, one down each pathway, so imports, the model, the cluster
+profiles and the pools are warm.
+
+Point it at a scratch MySQL-compatible server, or run it offline against an
+embedded SQLite file (the schema is migrated on the first run and every
+journey signs up a new user), for example:
+
+    python benchmarks/load_test.py --sqlite /tmp/campus_care_load.sqlite3
+    docker run -d --rm -p 3306:3306 -e MYSQL_ALLOW_EMPTY_PASSWORD=1 \\
+        -e MYSQL_DATABASE=campus_care_load mysql:8
+    python benchmarks/load_test.py --students 200 --concurrency 16
+    python benchmarks/load_test.py --students 50 --concurrency 4 --json results.json
+"""
+import argparse
+import functools
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> helpers timed per call; patched before the first run, so the
+# views (imported lazily by the router) pick up the timed versions
+SERVICE_HELPERS = {
+    "services.auth": ["create_user", "validate_user", "get_user_id"],
+    "services.records": ["save_self_check_visit", "save_high_risk_response", "save_reflection"],
+    "services.dashboard": ["load_dashboard", "run_query"],
+    "services.models": ["get_compiled_model", "assign_cluster"],
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+class JourneyError(Exception):
+    pass
+
+
+class LatencyRecorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._errors = {}
+
+    def record(self, name, seconds, failed=False):
+        with self._lock:
+            self._samples.setdefault(name, []).append(seconds)
+            if failed:
+                self._errors[name] = self._errors.get(name, 0) + 1
+
+    def timed(self, name, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self.record(name, time.perf_counter() - started, failed)
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._errors.clear()
+
+    def export(self):
+        with self._lock:
+            return {name: list(samples) for name, samples in self._samples.items()}, dict(self._errors)
+
+    def merge(self, samples, errors):
+        with self._lock:
+            for name, values in samples.items():
+                self._samples.setdefault(name, []).extend(values)
+            for name, count in errors.items():
+                self._errors[name] = self._errors.get(name, 0) + count
+
+    def summary(self):
+        with self._lock:
+            return {
+                name: dict(
+                    count=len(samples),
+                    errors=self._errors.get(name, 0),
+                    **{f"p{q}": _percentile(sorted(samples), q) for q in PERCENTILES},
+                    max=max(samples),
+                )
+                for name, samples in self._samples.items()
+            }
+
+
+def _percentile(ordered, q):
+    # Linear interpolation between the closest ranks
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _instrument(recorder):
+    for module_name, names in SERVICE_HELPERS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            setattr(module, name, recorder.timed(f"{module_name.rsplit('.', 1)[1]}.{name}", getattr(module, name)))
+
+
+class Journey:
+    # One simulated student; each step is a single script run, timed on its own
+    def __init__(self, recorder, run_id, index, high_risk_share, timeout, secrets):
+        self.recorder = recorder
+        self.timeout = timeout
+        self.secrets = secrets
+        self.rng = random.Random(f"{run_id}-{index}")
+        self.username = f"load-{run_id}-{index}"
+        self.password = f"pw-{run_id}-{index}"
+        self.high_risk = self.rng.random() < high_risk_share
+        self.at = self._app_test()
+
+    def _app_test(self):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=self.timeout)
+        at.secrets.update(self.secrets)
+        return at
+
+    def step(self, name, action):
+        started = time.perf_counter()
+        failed = True
+        try:
+            action()
+            if self.at.exception:
+                raise JourneyError(f"{name}: {self.at.exception[0].value}")
+            failed = False
+        finally:
+            self.recorder.record(f"page.{name}", time.perf_counter() - started, failed)
+
+    def click(self, name, label):
+        self.step(name, lambda: self.button(label).click().run())
+
+    def navigate(self, name, label, page):
+        # A page switch via st.rerun() leaves the elements of the cut-short run
+        # in AppTest's tree, and the next run trips over their missing widget
+        # state; carrying the session over to a fresh AppTest (untimed, like a
+        # browser refresh) starts the new page from a clean tree
+        self.click(name, label)
+        if self.at.session_state.page != page:
+            errors = [e.value for e in self.at.error] + [w.value for w in self.at.warning]
+            raise JourneyError(f"expected page {page}, got {self.at.session_state.page} {errors}")
+        # Widgets rebuild their values from the session on the new page
+        widget_keys = {
+            widget.key
+            for kind in ("button", "number_input", "radio", "slider", "text_area", "text_input")
+            for widget in getattr(self.at, kind)
+        }
+        state = {key: value for key, value in self.at.session_state.filtered_state.items() if key not in widget_keys}
+        self.at = self._app_test()
+        for key, value in state.items():
+            self.at.session_state[key] = value
+        self.at.run()
+
+    def button(self, label):
+        for button in self.at.button:
+            if label in button.label:
+                return button
+        raise JourneyError(f"no '{label}' button on page {self.at.session_state.page}")
+
+    def run(self):
+        self.step("overview", self.at.run)
+        self.click("auth", "Log In / Sign Up")
+
+        # The Sign Up / Log In button only appears once the radio has switched
+        self.at.radio[0].set_value("Sign Up")
+        self.at.text_input[0].set_value(self.username)
+        self.at.text_input[1].set_value(self.password)
+        self.at.run()
+        self.click("sign_up", "Sign Up")
+        if not self.at.success:
+            raise JourneyError(f"sign up failed: {[e.value for e in self.at.error + self.at.warning]}")
+
+        self.at.radio[0].set_value("Log In")
+        self.at.run()
+        self.navigate("log_in", "Log In", "self_check")
+
+        # SWEMWBS: a total of 21 or less takes the high-risk pathway
+        low, high = (1, 3) if self.high_risk else (4, 5)
+        for i in range(7):
+            self.at.slider(key=f"q{i + 1}").set_value(self.rng.randint(low, high))
+        self.click("self_check", "Show My Wellbeing Snapshot")
+
+        if self.high_risk:
+            self.navigate("high_risk_pathway", "View Supportive Resources", "high_risk_pathway")
+            self.at.number_input[0].set_value(self.rng.randint(18, 26))
+            self.at.number_input[1].set_value(self.rng.randint(0, 60))
+            self.at.number_input[2].set_value(self.rng.choice([4.0, 5.5, 7.0, 8.5]))
+            for slider in self.at.slider:
+                slider.set_value(self.rng.randint(1, 5))
+            self.click("high_risk_scoring", "Analyze My Mental Risk Level")
+        else:
+            self.navigate("low_risk_pathway", "Continue", "low_risk_pathway")
+            self.navigate("low_risk_modules", "Begin Wellness Modules", "low_risk_modules")
+            for module in (1, 2, 3):
+                self.at.text_area(key=f"mod{module}_input").set_value(f"Reflection {module} from {self.username}")
+                self.navigate(f"module_{module}", f"Complete Module {module}", "low_risk_modules")
+
+        self.navigate("dashboard", "Go to Dashboard", "dashboard")
+
+
+_start_barrier = None
+
+
+def _init_worker(barrier):
+    global _start_barrier
+    _start_barrier = barrier
+    # `streamlit run` puts the script's directory on sys.path; AppTest does not
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+
+def _run_worker(run_id, worker, students, concurrency, high_risk_share, timeout, secrets):
+    # Runs students worker, worker + concurrency, ... after an untimed warm-up
+    # down both pathways (the high-risk one loads the model and profiles)
+    recorder = LatencyRecorder()
+    _instrument(recorder)
+    failures = []
+
+    def journey(index, share=high_risk_share):
+        try:
+            Journey(recorder, run_id, index, share, timeout, secrets).run()
+        except Exception as e:
+            failures.append(f"student {index}: {e!r}")
+
+    journey(f"warmup{worker}-high", share=1.0)
+    journey(f"warmup{worker}-low", share=0.0)
+    recorder.reset()
+    _start_barrier.wait()
+
+    started = time.perf_counter()
+    for index in range(worker, students, concurrency):
+        journey(index)
+    return recorder.export(), failures, time.perf_counter() - started
+
+
+def run_load(students, concurrency, secrets, high_risk_share=0.5, timeout=60):
+    # Returns (recorder, failures, seconds until the last worker finished)
+    run_id = f"{int(time.time()):x}"
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(concurrency)
+    recorder = LatencyRecorder()
+    failures = []
+    elapsed = 0.0
+    with ProcessPoolExecutor(concurrency, mp_context=context, initializer=_init_worker, initargs=(barrier,)) as pool:
+        futures = [
+            pool.submit(_run_worker, run_id, worker, students, concurrency, high_risk_share, timeout, secrets)
+            for worker in range(concurrency)
+        ]
+        for future in futures:
+            (samples, errors), worker_failures, worker_elapsed = future.result()
+            recorder.merge(samples, errors)
+            failures.extend(worker_failures)
+            elapsed = max(elapsed, worker_elapsed)
+    return recorder, failures, elapsed
+
+
+def _print_table(summary):
+    width = max(len(name) for name in summary)
+    print(f"{'':{width}}  {'count':>6} {'errors':>6} " + " ".join(f"{'p%d' % q:>8}" for q in PERCENTILES) + f" {'max':>8}")
+    for name in sorted(summary):
+        row = summary[name]
+        cells = " ".join(f"{row[f'p{q}'] * 1000:8.1f}" for q in PERCENTILES)
+        print(f"{name:{width}}  {row['count']:6d} {row['errors']:6d} {cells} {row['max'] * 1000:8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=50, help="timed journeys in total")
+    parser.add_argument("--concurrency", type=int, default=8, help="journeys in flight at once")
+    parser.add_argument("--high-risk-share", type=float, default=0.5, help="share of students on the high-risk pathway")
+    parser.add_argument("--host", default=os.environ.get("MYSQL_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MYSQL_PORT", 3306)))
+    parser.add_argument("--user", default=os.environ.get("MYSQL_USER", "root"))
+    parser.add_argument("--password", default=os.environ.get("MYSQL_PASS", ""))
+    parser.add_argument("--database", default=os.environ.get("MYSQL_DB", "campus_care_load"))
+    parser.add_argument("--sqlite", metavar="PATH", help="use an embedded SQLite file instead of MySQL")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per script run")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        secrets = {"STORAGE_BACKEND": "sqlite", "SQLITE_PATH": os.path.abspath(args.sqlite)}
+    else:
+        secrets = {
+            "MYSQL_HOST": args.host,
+            "MYSQL_PORT": args.port,
+            "MYSQL_USER": args.user,
+            "MYSQL_PASS": args.password,
+            "MYSQL_DB": args.database,
+        }
+    secrets["AUTO_MIGRATE"] = True
+    recorder, failures, elapsed = run_load(args.students, args.concurrency, secrets, args.high_risk_share, args.timeout)
+
+    summary = recorder.summary()
+    print(f"{args.students} students ({len(failures)} failed, warm-ups included), concurrency {args.concurrency}: "
+          f"{elapsed:.1f}s ({args.students / elapsed if elapsed else 0:.2f} journeys/s)")
+    if summary:
+        print("Latency in ms")
+        _print_table(summary)
+    for failure in failures[:10]:
+        print(f"  {failure}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"students": args.students, "concurrency": args.concurrency, "elapsed": elapsed,
+                       "failures": failures, "latency": summary}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Micro-benchmarks for the helpers that run on every interaction.
+
+Each benchmark is timed with timeit (auto-ranged loops, best of several
+repeats) and compared with the per-call times in benchmarks/baselines.json,
+scaled by how fast a fixed reference workload ran in both runs. A benchmark
+more than --tolerance slower than its baseline is reported as a regression
+and the exit status is 1.
+
+    python benchmarks/micro.py                    # compare with the baselines
+    python benchmarks/micro.py -k cluster -k model
+    python benchmarks/micro.py --save             # re-record the baselines
+
+The reference scaling absorbs a busy or throttled box, not a different CPU
+architecture; re-record the baselines (and commit the file) when the
+reference machine changes.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    # Registers a setup function that returns the zero-argument callable to time
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _random_intake(rng):
+    # One row in scoring.MODEL_FEATURES order
+    return [
+        rng.randint(18, 26), rng.randint(0, 60), rng.randint(1, 5), rng.randint(1, 5),
+        rng.choice([4.0, 5.5, 7.0, 8.5]), rng.randint(1, 5), rng.randint(1, 5),
+        rng.randint(1, 5), rng.randint(1, 5), rng.randint(0, 1),
+    ]
+
+
+def _random_cluster_vector(rng):
+    # One row in scoring.CLUSTER_FEATURES order
+    return [
+        rng.randint(1, 5), rng.randint(0, 60), rng.randint(1, 5), rng.randint(1, 5),
+        rng.randint(1, 5), rng.randint(1, 5), rng.choice([4.0, 5.5, 7.0, 8.5]),
+        rng.randint(0, 1), rng.randint(1, 5), rng.randint(18, 26),
+    ]
+
+
+def _compiled_model():
+    import scoring
+    return scoring.ModelRegistry(warm=False).get_compiled(scoring.MODEL_PATH)
+
+
+def _cluster_profiles():
+    import scoring
+    return scoring.ClusterProfileStore(scoring.CLUSTER_PROFILES_PATH).get()
+
+
+@benchmark("cluster.assign")
+def _cluster_assign():
+    engine = _cluster_profiles().engine("Severe")
+    vector = _random_cluster_vector(random.Random(1))
+    return lambda: engine.assign(vector)
+
+
+@benchmark("cluster.assign_batch_1000")
+def _cluster_assign_batch():
+    import scoring
+    profiles = _cluster_profiles()
+    rng = random.Random(2)
+    vectors = [_random_cluster_vector(rng) for _ in range(1000)]
+    groups = [rng.choice(["Moderate", "Severe"]) for _ in range(1000)]
+    return lambda: scoring.assign_clusters(profiles, vectors, groups)
+
+
+@benchmark("cluster.parse_profiles")
+def _cluster_parse():
+    import scoring
+    # The CSV parse and lookup building a profile file change triggers
+    return lambda: scoring.ClusterProfileStore(scoring.CLUSTER_PROFILES_PATH).get()
+
+
+@benchmark("dashboard.recent_clusters")
+def _recent_clusters():
+    import datetime
+    from services.dashboard import _fetch_recent_clusters
+
+    profiles = _cluster_profiles()
+    rows = [
+        {"cluster": 1, "prediction_result": 2, "submitted_at": datetime.datetime(2025, 3, 2, 9, 30)},
+        {"cluster": 0, "prediction_result": 1, "submitted_at": datetime.datetime(2025, 2, 27, 21, 5)},
+    ]
+
+    class RowsCursor:
+        # Stands in for the DB cursor so only the per-row label lookup is timed
+        def execute(self, sql, params):
+            pass
+
+        def fetchall(self):
+            return rows
+
+    cursor = RowsCursor()
+    return lambda: _fetch_recent_clusters(cursor, 1, profiles)
+
+
+@benchmark("model.predict_one")
+def _predict_one():
+    model = _compiled_model()
+    row = _random_intake(random.Random(3))
+    return lambda: model.predict_one(row)
+
+
+@benchmark("model.predict_batch_1000")
+def _predict_batch():
+    import numpy as np
+    import scoring
+    model = scoring.ModelRegistry(warm=False).get(scoring.MODEL_PATH)
+    rng = random.Random(4)
+    X = np.array([_random_intake(rng) for _ in range(1000)], dtype=np.float64)
+    adapter = scoring.SklearnModelAdapter(model)
+    return lambda: adapter.predict(X)
+
+
+@benchmark("bcrypt.hash")
+def _bcrypt_hash():
+    # Through the app's hasher, so the worker hand-off and admission check are timed too
+    from services.auth import PasswordHasher
+    hasher = PasswordHasher(rounds=_bcrypt_rounds())
+    return lambda: hasher.hash("correct horse battery staple")
+
+
+@benchmark("bcrypt.verify")
+def _bcrypt_verify():
+    from services.auth import PasswordHasher
+    hasher = PasswordHasher(rounds=_bcrypt_rounds())
+    stored = hasher.hash("correct horse battery staple")
+    return lambda: hasher.verify(stored, "correct horse battery staple")
+
+
+@benchmark("swemwbs.score")
+def _swemwbs():
+    from views.self_check import risk_level
+    responses = [3, 4, 2, 5, 3, 3, 4]
+    return lambda: risk_level(sum(responses))
+
+
+def _bcrypt_rounds():
+    # The configured cost: BCRYPT_ROUNDS from the environment or secrets.toml
+    rounds = os.environ.get("BCRYPT_ROUNDS")
+    if rounds is None:
+        import tomllib
+        path = os.path.join(ROOT, ".streamlit", "secrets.toml")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                rounds = tomllib.load(f).get("BCRYPT_ROUNDS")
+    return int(rounds or 12)
+
+
+def measure(fn, repeat=5, min_time=0.2):
+    # Seconds per call: auto-ranged loop count, best of `repeat`
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _reference_workload():
+    # Fixed pure-Python work timed alongside the benchmarks; results are
+    # compared relative to it, so a busier or slower box is not a regression
+    return sum(i * i for i in range(2000))
+
+
+def _machine():
+    return f"{platform.machine()} {platform.processor() or platform.system()} / Python {platform.python_version()}"
+
+
+def _format(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="patterns", action="append", help="only run benchmarks containing this text")
+    parser.add_argument("--save", action="store_true", help="record the results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH, encoding="utf-8") as f:
+            baselines = json.load(f)
+    recorded = baselines.get("results", {})
+    if baselines and baselines.get("machine") != _machine() and not args.save:
+        print(f"Baselines were recorded on {baselines.get('machine')}; this is {_machine()}")
+
+    reference = measure(_reference_workload, repeat=args.repeat)
+    # >1 when this run's box is slower than the one that recorded the baselines
+    speed = reference / baselines["reference"] if "reference" in baselines else 1.0
+    print(f"{'reference':28} {_format(reference):>10}  (x{speed:.2f} of the baseline run)")
+
+    results = {}
+    regressions = []
+    for name, setup in BENCHMARKS.items():
+        if args.patterns and not any(p in name for p in args.patterns):
+            continue
+        seconds = measure(setup(), repeat=args.repeat)
+        results[name] = seconds
+        baseline = recorded.get(name)
+        if baseline is None:
+            verdict = "no baseline"
+        else:
+            change = seconds / (baseline * speed) - 1
+            verdict = f"{change:+.0%} vs {_format(baseline)}"
+            if change > args.tolerance:
+                verdict += "  REGRESSION"
+                regressions.append(name)
+        print(f"{name:28} {_format(seconds):>10}  {verdict}")
+
+    if args.save:
+        # Re-recorded benchmarks are scaled to the stored reference run
+        if "reference" in baselines:
+            results = {name: seconds / speed for name, seconds in results.items()}
+        else:
+            baselines["reference"] = reference
+        baselines.update(machine=_machine(), results={**recorded, **results})
+        with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved {len(results)} baselines to {os.path.relpath(BASELINES_PATH, ROOT)}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Parse overhead of the app's fixed statements: prepared once vs parsed per call.
+
+Runs each read statement the app sends on every dashboard or login (the
+dashboard queries and the username lookup) on one connection and reports
+the time per execute-and-fetch both ways:
+
+- SQLite (the default, offline): a seeded scratch database, with sqlite3's
+  per-connection statement cache switched off (every call is compiled) and
+  on (compiled once, as the app runs).
+- MySQL (--host): pymysql's client-side interpolation over the text
+  protocol, where the server parses every call, against server-side
+  prepared statements over the binary protocol (MYSQL_PREPARED_STATEMENTS,
+  needs mysql-connector-python). The schema is migrated if missing; point
+  it at a scratch or read replica database.
+
+    python benchmarks/statements.py
+    python benchmarks/statements.py --host db.internal --user app --database campus_care
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from micro import _format, measure
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+USER_LOOKUP = "SELECT id FROM users WHERE username = %s"
+
+
+def _statements(user_id, username):
+    # name -> (sql, params), as services.auth and services.dashboard send them
+    import queries
+    statements = {"user_lookup": (USER_LOOKUP, (username,))}
+    for name, (sql, n_params) in queries.DASHBOARD_QUERIES.items():
+        statements[name] = (sql, (user_id,) * n_params)
+    return statements
+
+
+def _seed(conn, rows):
+    # One student with a realistic history, plus other students' rows around it
+    with conn.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO users (username, password) VALUES (%s, %s)",
+            [(f"student{i}", "x") for i in range(1, 101)],
+        )
+        cursor.executemany(
+            "INSERT INTO self_check_logs (user_id, score, risk_level) VALUES (%s, %s, %s)",
+            [(1 + i % 100, 14 + i % 21, "High" if i % 3 else "Low") for i in range(rows)],
+        )
+        cursor.executemany(
+            "INSERT INTO high_risk_responses (user_id, prediction_result, cluster) VALUES (%s, %s, %s)",
+            [(1 + i % 100, i % 3, i % 4) for i in range(rows)],
+        )
+        cursor.executemany(
+            "INSERT INTO latest_user_reflections (user_id, module_name, reflection) VALUES (%s, %s, %s)",
+            [(user, f"module_{m}", "text") for user in range(1, 101) for m in range(1, 4)],
+        )
+    conn.commit()
+
+
+def _time(conn, statements, repeat):
+    def run(sql, params):
+        def call():
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                cursor.fetchall()
+        return call
+
+    results = {}
+    for name, (sql, params) in statements.items():
+        call = run(sql, params)
+        call()      # the first call prepares
+        results[name] = measure(call, repeat=repeat)
+    return results
+
+
+def _print(columns, results):
+    names = list(next(iter(results.values())))
+    print(f"{'statement':20} " + " ".join(f"{column:>16}" for column in columns) + f" {'change':>8}")
+    for name in names:
+        times = [results[column][name] for column in columns]
+        change = f"{times[-1] / times[0] - 1:+.0%}" if len(times) > 1 else ""
+        print(f"{name:20} " + " ".join(f"{_format(t):>16}" for t in times) + f" {change:>8}")
+
+
+def run_sqlite(path, rows, repeat):
+    import migrations
+    import storage
+    results = {}
+    for label, cached in (("compiled per call", 0), ("compiled once", 128)):
+        backend = storage.SQLiteBackend(path, cached_statements=cached)
+        conn = backend.connect()
+        try:
+            if migrations.current_version(conn, backend) == 0:
+                migrations.migrate(conn, backend)
+                _seed(conn, rows)
+            results[label] = _time(conn, _statements(1, "student1"), repeat)
+        finally:
+            conn.close()
+    _print(list(results), results)
+
+
+def run_mysql(args):
+    import migrations
+    import storage
+    settings = dict(host=args.host, port=args.port, user=args.user, password=args.password, database=args.database)
+    results = {}
+    for label, prepared in (("text protocol", False), ("prepared", True)):
+        backend = storage.MySQLBackend(**settings, prepared_statements=prepared)
+        if prepared and backend.connector is None:
+            print("mysql-connector-python is not installed; only the text protocol was measured")
+            break
+        conn = backend.connect()
+        try:
+            migrations.migrate(conn, backend)
+            results[label] = _time(conn, _statements(args.user_id, args.username), args.repeat)
+        finally:
+            conn.close()
+    _print(list(results), results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sqlite", metavar="PATH", help="SQLite file to use (default: a new temporary one)")
+    parser.add_argument("--rows", type=int, default=20000, help="rows seeded into a new SQLite file")
+    parser.add_argument("--host", help="benchmark this MySQL server instead of SQLite")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MYSQL_PORT", 3306)))
+    parser.add_argument("--user", default=os.environ.get("MYSQL_USER", "root"))
+    parser.add_argument("--password", default=os.environ.get("MYSQL_PASS", ""))
+    parser.add_argument("--database", default=os.environ.get("MYSQL_DB", "campus_care_load"))
+    parser.add_argument("--user-id", type=int, default=1, help="student the MySQL queries look up")
+    parser.add_argument("--username", default="student1")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    if args.host:
+        run_mysql(args)
+        return 0
+    if args.sqlite:
+        run_sqlite(args.sqlite, args.rows, args.repeat)
+        return 0
+    with tempfile.TemporaryDirectory() as directory:
+        run_sqlite(os.path.join(directory, "statements.sqlite3"), args.rows, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
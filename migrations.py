@@ -0,0 +1,248 @@
+"""Versioned schema migrations for the Campus Care database (MySQL or SQLite).
+
+    python migrations.py            # apply pending migrations
+    python migrations.py --check    # report missing indexes, change nothing
+    python migrations.py --explain  # EXPLAIN the dashboard queries
+
+Connection settings are read from .streamlit/secrets.toml (the same
+STORAGE_BACKEND, MYSQL_* and SQLITE_PATH keys the app uses) and can be
+overridden with environment variables. Both backends get the same tables
+and indexes; see storage.py for the statements whose syntax differs.
+"""
+import argparse
+import os
+import sys
+import tomllib
+from collections import namedtuple
+
+import queries
+import storage
+
+# apply(cursor, backend)
+Migration = namedtuple("Migration", ["version", "description", "apply"])
+
+# table -> {index name: columns}; each index matches one per-user access path
+EXPECTED_INDEXES = {
+    "users": {
+        "uq_users_username": ("username",),
+    },
+    # COUNT / SUM(risk_level = ...) WHERE user_id = ?
+    "self_check_logs": {
+        "idx_self_check_user_risk": ("user_id", "risk_level"),
+    },
+    # WHERE user_id = ? ORDER BY submitted_at DESC LIMIT 2, covering the selected columns
+    "high_risk_responses": {
+        "idx_high_risk_user_submitted": ("user_id", "submitted_at", "cluster", "prediction_result"),
+    },
+    # Per-user reflection history, and the backfill of latest_user_reflections
+    "user_reflections": {
+        "idx_reflections_user_module_created": ("user_id", "module_name", "created_at"),
+    },
+}
+
+# {id} and {options} are filled in from the backend
+BASE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id {id},
+        username VARCHAR(255) NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) {options}
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS self_check_logs (
+        id {id},
+        user_id INT NOT NULL,
+        score INT NOT NULL,
+        risk_level VARCHAR(10) NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) {options}
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS high_risk_responses (
+        id {id},
+        user_id INT NOT NULL,
+        age INT,
+        study_hours INT,
+        coursework_pressure TINYINT,
+        academic_workload TINYINT,
+        sleep_hours DECIMAL(3, 1),
+        physical_activity TINYINT,
+        isolation TINYINT,
+        financial_stress TINYINT,
+        cocurricular TINYINT,
+        suicidal_thoughts TINYINT,
+        prediction_result TINYINT NOT NULL,
+        cluster INT NOT NULL,
+        submitted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) {options}
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_reflections (
+        id {id},
+        user_id INT NOT NULL,
+        module_name VARCHAR(50) NOT NULL,
+        reflection TEXT NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ) {options}
+    """,
+]
+
+
+def _create_base_tables(cursor, backend):
+    for statement in BASE_TABLES:
+        cursor.execute(statement.format(id=backend.auto_id, options=backend.table_options))
+
+
+def _add_dashboard_indexes(cursor, backend):
+    # Databases created before this module existed may already have some of these
+    existing = backend.existing_indexes(cursor)
+    for table, indexes in EXPECTED_INDEXES.items():
+        for name, columns in indexes.items():
+            if (table, name) in existing:
+                continue
+            backend.create_index(cursor, table, name, columns, unique=name.startswith("uq_"))
+
+
+def _create_latest_reflections(cursor, backend):
+    # One row per (user, module), upserted by every new reflection
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS latest_user_reflections (
+            user_id INT NOT NULL,
+            module_name VARCHAR(50) NOT NULL,
+            reflection TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, module_name)
+        ) {backend.table_options}
+    """)
+    # Backfill from the history; ids are auto-increment, so the highest id per
+    # (user, module) is the newest reflection even when timestamps tie. The
+    # WHERE keeps SQLite from reading ON CONFLICT as part of the join.
+    cursor.execute(f"""
+        INSERT INTO latest_user_reflections (user_id, module_name, reflection, created_at)
+        SELECT ur.user_id, ur.module_name, ur.reflection, ur.created_at
+        FROM user_reflections ur
+        INNER JOIN (
+            SELECT MAX(id) AS id
+            FROM user_reflections
+            GROUP BY user_id, module_name
+        ) latest ON ur.id = latest.id
+        WHERE 1 = 1
+        {backend.upsert(("user_id", "module_name"), {"reflection": None, "created_at": None})}
+    """)
+
+
+MIGRATIONS = [
+    Migration(1, "create base tables", _create_base_tables),
+    Migration(2, "composite indexes for the per-user dashboard queries", _add_dashboard_indexes),
+    Migration(3, "latest reflection per (user, module) summary table", _create_latest_reflections),
+]
+
+
+def _ensure_migrations_table(cursor, backend):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) {backend.table_options}
+    """)
+
+
+def current_version(conn, backend):
+    with conn.cursor() as cursor:
+        _ensure_migrations_table(cursor, backend)
+        cursor.execute("SELECT COALESCE(MAX(version), 0) AS version FROM schema_migrations")
+        return int(cursor.fetchone()["version"])
+
+
+def migrate(conn, backend, target=None):
+    # Runs under the backend's migration lock and reads the version only once
+    # it is held, so app processes starting together with AUTO_MIGRATE apply
+    # each migration once. SQLite applies them all in one transaction; MySQL
+    # connections autocommit, and its DDL would commit implicitly anyway.
+    applied = []
+    with backend.migration_lock(conn):
+        try:
+            version = current_version(conn, backend)
+            for migration in MIGRATIONS:
+                if migration.version <= version or (target is not None and migration.version > target):
+                    continue
+                with conn.cursor() as cursor:
+                    migration.apply(cursor, backend)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                        (migration.version, migration.description),
+                    )
+                applied.append(migration.version)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return applied
+
+
+def missing_indexes(conn, backend):
+    with conn.cursor() as cursor:
+        existing = backend.existing_indexes(cursor)
+    return [
+        (table, name)
+        for table, indexes in EXPECTED_INDEXES.items()
+        for name in indexes
+        if (table, name) not in existing
+    ]
+
+
+def check_query_plans(conn, backend, user_id=0):
+    # Returns {query name: [problems]}; a query passes when every base-table
+    # access in its plan goes through an index instead of a full scan
+    problems = {}
+    for name, (sql, n_params) in queries.DASHBOARD_QUERIES.items():
+        with conn.cursor() as cursor:
+            problems[name] = backend.plan_issues(cursor, sql, (user_id,) * n_params)
+    return problems
+
+
+def _backend():
+    secrets = {}
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            secrets = tomllib.load(f)
+    return storage.backend_from_settings(lambda key, default=None: os.environ.get(key, secrets.get(key, default)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only report missing indexes")
+    parser.add_argument("--explain", action="store_true", help="EXPLAIN the dashboard queries")
+    parser.add_argument("--user-id", type=int, default=0, help="user id to EXPLAIN the queries with")
+    args = parser.parse_args(argv)
+
+    backend = _backend()
+    conn = backend.connect()
+    try:
+        if not args.check and not args.explain:
+            applied = migrate(conn, backend)
+            print(f"Applied migrations: {applied or 'none'} (schema version {current_version(conn, backend)})")
+
+        status = 0
+        missing = missing_indexes(conn, backend)
+        for table, name in missing:
+            print(f"Missing index {name} on {table}")
+            status = 1
+
+        if args.explain:
+            for name, issues in check_query_plans(conn, backend, args.user_id).items():
+                print(f"{name}: {'uses indexes' if not issues else 'FULL SCAN'}")
+                for issue in issues:
+                    print(f"    {issue}")
+                    status = 1
+        return status
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
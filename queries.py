@@ -0,0 +1,34 @@
+# SQL for the per-user read paths. Kept in one place so the app and the
+# EXPLAIN checks in migrations.py always look at the same statements.
+
+SELF_CHECK_STATS = """
+    SELECT COUNT(*) AS total,
+           COALESCE(SUM(risk_level = 'Low'), 0) AS low,
+           COALESCE(SUM(risk_level = 'High'), 0) AS high
+    FROM self_check_logs
+    WHERE user_id = %s
+"""
+
+RECENT_CLUSTERS = """
+    SELECT cluster, prediction_result, submitted_at
+    FROM high_risk_responses
+    WHERE user_id = %s
+    ORDER BY submitted_at DESC
+    LIMIT 2
+"""
+
+# Reads the summary table maintained by save_reflection: one primary-key
+# range scan over at most one row per module, however many reflections exist
+LATEST_REFLECTIONS = """
+    SELECT module_name, reflection, created_at
+    FROM latest_user_reflections
+    WHERE user_id = %s
+    ORDER BY module_name
+"""
+
+# name -> (sql, number of user_id parameters)
+DASHBOARD_QUERIES = {
+    "self_check_stats": (SELF_CHECK_STATS, 1),
+    "recent_clusters": (RECENT_CLUSTERS, 1),
+    "latest_reflections": (LATEST_REFLECTIONS, 1),
+}
@@ -0,0 +1,536 @@
+"""Headless scoring for the Campus Care stacking model and cluster profiles.
+
+Used by the app (services/models.py) for single students and from the command line for whole
+cohorts:
+
+    python scoring.py responses.csv scored.csv
+    python scoring.py responses.parquet scored.parquet --chunksize 100000
+
+The input needs the intake columns in MODEL_FEATURES (the names the model
+was fitted on); extra columns are passed through. Each output row gains
+``prediction``, ``risk_group``, ``cluster`` and ``cluster_name`` (cluster
+is -1 for Mild predictions).
+
+    python scoring.py --verify-compiled Form_Responses.csv
+
+checks that the compiled NumPy model the app uses for single predictions
+gives the same classes as the pickled StackingClassifier.
+"""
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import sys
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Model output -> cluster profile group
+GROUP_LABELS = {0: "Mild", 1: "Moderate", 2: "Severe"}
+
+
+MODEL_PATH = "log_stacking_model.pkl"
+
+
+# Column order the stacking model was fitted on
+MODEL_FEATURES = [
+    "Age", "Study_Hours_Per_Week", "Academic_Workload", "Coursework_Pressure",
+    "Sleep_Hours_Per_Night", "Physical_Activity_Freq", "Financial_Stress",
+    "CoCurricular_Involvement", "Isolation_Frequency", "Recent_Suicidal_Thoughts"
+]
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _softmax(scores):
+    # Same steps as sklearn.utils.extmath.softmax, row-wise
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=-1, keepdims=True)
+    return scores
+
+
+def _is_multinomial(lr):
+    # sklearn fits one-vs-rest when asked to, and always with liblinear; the
+    # compiled model only implements the multinomial softmax
+    multi_class = getattr(lr, "multi_class", "auto")
+    if multi_class == "ovr" or lr.solver == "liblinear":
+        return False
+    return multi_class in ("multinomial", "auto", "deprecated")
+
+
+class CompiledStackingModel:
+    # Flat NumPy version of the fitted StackingClassifier: a multinomial
+    # LogisticRegression and a RandomForest as base estimators (predict_proba)
+    # feeding a multinomial LogisticRegression meta-learner. Scores float
+    # arrays in MODEL_FEATURES order directly, without pandas or sklearn's
+    # input validation.
+    def __init__(self, model):
+        base_lr, forest = model.estimators_
+        final = model.final_estimator_
+        if (type(base_lr).__name__, type(forest).__name__, type(final).__name__) != \
+                ("LogisticRegression", "RandomForestClassifier", "LogisticRegression"):
+            raise TypeError("Only LogisticRegression + RandomForest stacks can be compiled")
+        if list(model.stack_method_) != ["predict_proba", "predict_proba"] or model.passthrough:
+            raise TypeError("Only predict_proba stacking without passthrough can be compiled")
+        if base_lr.coef_.shape[0] == 1 or final.coef_.shape[0] == 1:
+            raise TypeError("Only multi-class models can be compiled")
+        if not (_is_multinomial(base_lr) and _is_multinomial(final)):
+            raise TypeError("Only multinomial LogisticRegressions can be compiled (not one-vs-rest or liblinear)")
+
+        self.classes_ = np.asarray(model.classes_)
+        self._final_classes = np.asarray(final.classes_)
+        self.lr_coef = np.ascontiguousarray(base_lr.coef_.T, dtype=np.float64)
+        self.lr_intercept = np.asarray(base_lr.intercept_, dtype=np.float64)
+        self.final_coef = np.ascontiguousarray(final.coef_.T, dtype=np.float64)
+        self.final_intercept = np.asarray(final.intercept_, dtype=np.float64)
+
+        # Concatenate every tree into one node table. Leaves point at themselves
+        # with an infinite threshold, so all trees can be walked in lockstep.
+        left, right, feature, threshold, value, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            own = np.arange(tree.node_count) + offset
+            left.append(np.where(is_leaf, own, tree.children_left + offset))
+            right.append(np.where(is_leaf, own, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            proba = tree.value[:, 0, :].astype(np.float64)
+            normalizer = proba.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(proba / normalizer)
+            roots.append(offset)
+            offset += tree.node_count
+        self.left = np.concatenate(left).astype(np.intp)
+        self.right = np.concatenate(right).astype(np.intp)
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold)
+        self.value = np.concatenate(value)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.depth = max(estimator.tree_.max_depth for estimator in forest.estimators_)
+        self.n_features = self.lr_coef.shape[0]
+
+    def _forest_proba(self, X):
+        # sklearn trees compare float32 features against float64 thresholds
+        X32 = X.astype(np.float32).astype(np.float64).ravel()
+        row_offset = (np.arange(len(X)) * self.n_features)[:, None]
+        node = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.depth):
+            go_left = X32[row_offset + self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node].sum(axis=1) / len(self.roots)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.n_features)
+        lr_proba = _softmax(X @ self.lr_coef + self.lr_intercept)
+        meta = np.hstack([lr_proba, self._forest_proba(X)])
+        return _softmax(meta @ self.final_coef + self.final_intercept)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.n_features)
+        lr_proba = _softmax(X @ self.lr_coef + self.lr_intercept)
+        meta = np.hstack([lr_proba, self._forest_proba(X)])
+        scores = meta @ self.final_coef + self.final_intercept
+        return self.classes_[self._final_classes[scores.argmax(axis=1)]]
+
+    def predict_one(self, row):
+        # 1-D version of predict for the interactive path
+        x = np.asarray(row, dtype=np.float64)
+        x32 = x.astype(np.float32).astype(np.float64)
+        node = self.roots
+        for _ in range(self.depth):
+            node = np.where(x32[self.feature[node]] <= self.threshold[node], self.left[node], self.right[node])
+        forest_proba = self.value[node].sum(axis=0) / len(self.roots)
+        lr_proba = _softmax(x @ self.lr_coef + self.lr_intercept)
+        scores = np.concatenate([lr_proba, forest_proba]) @ self.final_coef + self.final_intercept
+        return self.classes_[self._final_classes[scores.argmax()]]
+
+
+class SklearnModelAdapter:
+    # Same interface as CompiledStackingModel for models that cannot be compiled
+    def __init__(self, model):
+        self.model = model
+        self.classes_ = np.asarray(model.classes_)
+
+    def _frame(self, X):
+        import pandas as pd
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(MODEL_FEATURES))
+        return pd.DataFrame(X, columns=MODEL_FEATURES)
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(self._frame(X))
+
+    def predict(self, X):
+        return self.model.predict(self._frame(X))
+
+    def predict_one(self, row):
+        return self.predict(row)[0]
+
+
+def compile_model(model):
+    try:
+        return CompiledStackingModel(model)
+    except (TypeError, AttributeError, ValueError):
+        return SklearnModelAdapter(model)
+
+
+def verify_compiled(model, compiled, X, atol=1e-6):
+    # Returns the row indices where the compiled model disagrees with sklearn,
+    # on the class or on any probability by more than atol
+    import pandas as pd
+    X = np.asarray(X, dtype=np.float64)
+    frame = pd.DataFrame(X, columns=MODEL_FEATURES)
+    wrong_class = compiled.predict(X) != model.predict(frame)
+    wrong_proba = np.abs(compiled.predict_proba(X) - model.predict_proba(frame)).max(axis=1) > atol
+    return np.flatnonzero(wrong_class | wrong_proba)
+
+
+def verification_sample(n=256, seed=0):
+    # Fixed synthetic intakes (encoded answers and ages in the survey's range)
+    # that every hot-loaded model is checked on before it serves students
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, 6, size=(n, len(MODEL_FEATURES))).astype(np.float64)
+    X[:, MODEL_FEATURES.index("Age")] = rng.integers(17, 41, size=n)
+    return X
+
+
+# Columns the training notebook label-encodes before fitting
+_LABEL_ENCODED = [
+    "Study_Hours_Per_Week", "Academic_Workload", "Coursework_Pressure", "Sleep_Hours_Per_Night",
+    "Physical_Activity_Freq", "Financial_Stress", "CoCurricular_Involvement",
+    "Isolation_Frequency", "Recent_Suicidal_Thoughts",
+]
+
+
+def encode_form_responses(df):
+    # Rebuilds the model's training features from the raw survey export the
+    # same way the notebook does (LabelEncoder == rank among sorted uniques)
+    import pandas as pd
+    X = pd.DataFrame(index=df.index)
+    X["Age"] = pd.to_numeric(df["Age"], errors="coerce")
+    for col in _LABEL_ENCODED:
+        X[col] = np.unique(df[col].to_numpy(), return_inverse=True)[1]
+    return X[MODEL_FEATURES].astype(np.float64)
+
+
+_ModelEntry = namedtuple("_ModelEntry", ["mtime", "digest", "model", "compiled"])
+
+
+class ModelRegistry:
+    # Process-wide cache of unpickled models. The file is only re-hashed when its
+    # mtime changes, and only re-loaded when the hash changes too. Each model is
+    # compiled to a CompiledStackingModel once, right after loading, and only
+    # kept compiled if it agrees with sklearn on verification_sample().
+    def __init__(self, warm=True, verify=True):
+        self.warm = warm
+        self.verify = verify
+        self._lock = threading.Lock()
+        self._entries = {}      # path -> _ModelEntry
+
+    def _warm_up(self, compiled):
+        compiled.predict_one([0.0] * len(MODEL_FEATURES))
+
+    def _entry(self, path):
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(path)
+        if entry and entry.mtime == mtime:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry.mtime == mtime:
+                return entry
+            digest = _file_digest(path)
+            if entry and entry.digest == digest:
+                # Touched but unchanged, keep the loaded instance
+                entry = entry._replace(mtime=mtime)
+            else:
+                import joblib      # pulls in sklearn/scipy when unpickling; only pay for it here
+                model = joblib.load(path)
+                compiled = self._compile(model, path)
+                if self.warm:
+                    self._warm_up(compiled)
+                entry = _ModelEntry(mtime, digest, model, compiled)
+            self._entries[path] = entry
+            return entry
+
+    def _compile(self, model, path):
+        compiled = compile_model(model)
+        if not self.verify or not isinstance(compiled, CompiledStackingModel):
+            return compiled
+        mismatches = verify_compiled(model, compiled, verification_sample())
+        if len(mismatches):
+            logger.warning("Compiled %s disagrees with sklearn on %d sample rows; scoring with sklearn",
+                           path, len(mismatches))
+            return SklearnModelAdapter(model)
+        return compiled
+
+    def get(self, path=MODEL_PATH):
+        return self._entry(path).model
+
+    def get_compiled(self, path=MODEL_PATH):
+        return self._entry(path).compiled
+
+    def version(self, path=MODEL_PATH):
+        entry = self._entries.get(path)
+        return entry.digest if entry else None
+
+
+CLUSTER_PROFILES_PATH = "all_cluster_profiles.csv"
+
+
+# Feature order of the centroid columns in the cluster profile CSV
+CLUSTER_FEATURES = [
+    "Coursework_Pressure", "Study_Hours_Per_Week", "Academic_Workload",
+    "CoCurricular_Involvement", "Isolation_Frequency", "Physical_Activity_Freq",
+    "Sleep_Hours_Per_Night", "Recent_Suicidal_Thoughts", "Financial_Stress", "Age"
+]
+
+
+ClusterProfile = namedtuple("ClusterProfile", ["group", "cluster", "name", "description", "features"])
+
+
+class NearestCentroidEngine:
+    # Min-max scaling frozen from a group's centroids (what MinMaxScaler().fit
+    # produced on every call before) plus a contiguous centroid array, so
+    # assignment is a single vectorised distance computation.
+    def __init__(self, cluster_ids, centroids):
+        centroids = np.ascontiguousarray(centroids, dtype=np.float64)
+        data_min = centroids.min(axis=0)
+        data_range = centroids.max(axis=0) - data_min
+        data_range[data_range == 0.0] = 1.0      # same zero-range handling as sklearn
+        self.scale = 1.0 / data_range
+        self.offset = -data_min * self.scale
+        self.cluster_ids = np.asarray(cluster_ids, dtype=np.int64)
+        self.centroids = centroids
+        for arr in (self.scale, self.offset, self.cluster_ids, self.centroids):
+            arr.flags.writeable = False
+
+    def assign_batch(self, user_vectors):
+        X = np.asarray(user_vectors, dtype=np.float64).reshape(-1, self.centroids.shape[1])
+        X = X * self.scale + self.offset
+        diff = X[:, None, :] - self.centroids[None, :, :]
+        distances = np.einsum("ijk,ijk->ij", diff, diff)
+        return self.cluster_ids[np.argmin(distances, axis=1)]
+
+    def assign(self, user_vector):
+        return int(self.assign_batch(user_vector)[0])
+
+
+class ClusterProfiles:
+    # Immutable, parsed view of the cluster profile CSV:
+    # (Group, Cluster) -> ClusterProfile, plus a read-only centroid matrix per group.
+    def __init__(self, rows):
+        # rows: dicts keyed by the CSV header, e.g. from csv.DictReader
+        by_group = {}
+        for row in rows:
+            by_group.setdefault(row["Group"], []).append(row)
+
+        profiles = {}
+        centroids = {}
+        engines = {}
+        for group, group_rows in by_group.items():
+            ids = np.array([int(float(row["Cluster"])) for row in group_rows], dtype=np.int64)
+            matrix = np.array([[float(row[f]) for f in CLUSTER_FEATURES] for row in group_rows], dtype=np.float64)
+            ids.flags.writeable = False
+            matrix.flags.writeable = False
+            centroids[group] = (ids, matrix)
+            engines[group] = NearestCentroidEngine(ids, matrix)
+
+            for cluster, row, features in zip(ids, group_rows, matrix):
+                cluster = int(cluster)
+                name = row.get("Cluster_Name")
+                description = row.get("Cluster_Description")
+                profiles[(group, cluster)] = ClusterProfile(
+                    group=group,
+                    cluster=cluster,
+                    name=name or f"{group} Cluster {cluster}",
+                    description=description or "No description provided.",
+                    features=tuple(float(v) for v in features),
+                )
+        self._profiles = MappingProxyType(profiles)
+        self._centroids = MappingProxyType(centroids)
+        self._engines = MappingProxyType(engines)
+
+    def get(self, group, cluster, default=None):
+        return self._profiles.get((group, int(cluster)), default)
+
+    def centroids(self, group):
+        # Returns (cluster_ids, centroid_matrix) for one group
+        return self._centroids[group]
+
+    def engine(self, group):
+        return self._engines[group]
+
+    def groups(self):
+        return list(self._centroids)
+
+
+class ClusterProfileStore:
+    # Parses the CSV once and re-parses only when the file's mtime changes
+    def __init__(self, path=CLUSTER_PROFILES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._profiles = None
+
+    def get(self):
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self._mtime:
+            return self._profiles
+        with self._lock:
+            if mtime != self._mtime:
+                with open(self.path, newline="", encoding="utf-8-sig") as f:
+                    self._profiles = ClusterProfiles(csv.DictReader(f))
+                self._mtime = mtime
+            return self._profiles
+
+
+def assign_clusters(profiles, user_vectors, group_labels):
+    # Batch version of assign_cluster: one row per user (CLUSTER_FEATURES order)
+    # and one group label per row. Returns an int array of cluster numbers.
+    X = np.asarray(user_vectors, dtype=np.float64).reshape(-1, len(CLUSTER_FEATURES))
+    group_labels = np.asarray(group_labels)
+    if group_labels.shape != (len(X),):
+        raise ValueError("Need exactly one group label per user vector")
+    result = np.empty(len(X), dtype=np.int64)
+    for group in np.unique(group_labels):
+        mask = group_labels == group
+        result[mask] = profiles.engine(group).assign_batch(X[mask])
+    return result
+
+
+def score_frame(df, model, profiles):
+    # Scores a chunk of intake answers in one predict call and attaches clusters
+    missing = [col for col in MODEL_FEATURES if col not in df.columns]
+    if missing:
+        raise ValueError(f"Input is missing intake columns: {', '.join(missing)}")
+
+    predictions = np.asarray(model.predict(df[MODEL_FEATURES]), dtype=np.int64)
+    groups = np.array([GROUP_LABELS.get(p, "Mild") for p in predictions], dtype=object)
+
+    clusters = np.full(len(df), -1, dtype=np.int64)
+    names = np.full(len(df), None, dtype=object)
+    clustered = np.isin(groups, profiles.groups())
+    if clustered.any():
+        clusters[clustered] = assign_clusters(
+            profiles,
+            df.loc[clustered, CLUSTER_FEATURES].to_numpy(dtype=np.float64),
+            groups[clustered],
+        )
+        for i in np.flatnonzero(clustered):
+            names[i] = profiles.get(groups[i], clusters[i]).name
+
+    out = df.copy()
+    out["prediction"] = predictions
+    out["risk_group"] = groups
+    out["cluster"] = clusters
+    out["cluster_name"] = names
+    return out
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def iter_chunks(path, chunksize):
+    if _is_parquet(path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Reading Parquet needs pyarrow (pip install pyarrow)") from None
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class _ChunkWriter:
+    # Appends scored chunks to a CSV or Parquet file
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_csv_header = False
+
+    def write(self, df):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self._wrote_csv_header else "w",
+                      header=not self._wrote_csv_header, index=False)
+            self._wrote_csv_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_file(input_path, output_path, chunksize=50_000, model=None, profiles=None,
+               model_path=MODEL_PATH, profiles_path=CLUSTER_PROFILES_PATH):
+    model = model if model is not None else ModelRegistry().get(model_path)
+    profiles = profiles if profiles is not None else ClusterProfileStore(profiles_path).get()
+
+    writer = _ChunkWriter(output_path)
+    rows = 0
+    try:
+        for chunk in iter_chunks(input_path, chunksize):
+            writer.write(score_frame(chunk, model, profiles))
+            rows += len(chunk)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file of high-risk intake answers.")
+    parser.add_argument("input", nargs="?", help="CSV or Parquet file with the MODEL_FEATURES columns")
+    parser.add_argument("output", nargs="?", help="where to write the scored rows (.csv or .parquet)")
+    parser.add_argument("--verify-compiled", metavar="FORM_RESPONSES_CSV",
+                        help="check the compiled model against sklearn on the raw survey export and exit")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="rows scored per predict call")
+    parser.add_argument("--model", default=MODEL_PATH, help="path to the pickled stacking model")
+    parser.add_argument("--profiles", default=CLUSTER_PROFILES_PATH, help="path to the cluster profile CSV")
+    args = parser.parse_args(argv)
+
+    if args.verify_compiled:
+        registry = ModelRegistry(warm=False, verify=False)     # report mismatches rather than fall back
+        compiled = registry.get_compiled(args.model)
+        if not isinstance(compiled, CompiledStackingModel):
+            print("Model could not be compiled; the app falls back to sklearn")
+            return 1
+        import pandas as pd
+        X = encode_form_responses(pd.read_csv(args.verify_compiled, encoding="utf-8-sig"))
+        mismatches = verify_compiled(registry.get(args.model), compiled, X)
+        print(f"{len(X) - len(mismatches)}/{len(X)} predictions identical")
+        return 1 if len(mismatches) else 0
+    if not args.input or not args.output:
+        parser.error("input and output are required unless --verify-compiled is given")
+
+    rows = score_file(args.input, args.output, chunksize=args.chunksize,
+                      model_path=args.model, profiles_path=args.profiles)
+    print(f"Scored {rows} rows -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
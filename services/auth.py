@@ -0,0 +1,181 @@
+"""Password hashing, logins and the user id lookup."""
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+import bcrypt
+import streamlit as st
+
+from services.cache import LRUTTLCache
+from services.db import get_db_connection, storage_backend
+from services.metrics import REGISTRY, timed, timer
+
+class PasswordServiceBusy(Exception):
+    pass
+
+class PasswordHasher:
+    # bcrypt runs on a small dedicated thread pool (bcrypt releases the GIL), so a
+    # login storm can use at most `workers` cores. Requests beyond `max_pending`
+    # are rejected straight away instead of piling up behind each other.
+    def __init__(self, rounds=12, workers=2, max_pending=32, timeout=15.0):
+        self.rounds = rounds
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="campus-care-bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _call(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordServiceBusy("Too many password checks in progress")
+            self._pending += 1
+
+        def task():
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+
+        try:
+            future = self._executor.submit(task)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            raise PasswordServiceBusy("Password check timed out") from None
+
+    def hash(self, password):
+        with timer("bcrypt", "hash"):
+            return self._call(lambda: bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds)))
+
+    def verify(self, stored_password, provided_password):
+        if isinstance(stored_password, str):
+            stored_password = stored_password.encode("utf-8")
+        with timer("bcrypt", "verify"):
+            return self._call(bcrypt.checkpw, provided_password.encode('utf-8'), stored_password)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self._pending - self._running,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+@st.cache_resource
+def _password_hasher():
+    hasher = PasswordHasher(
+        rounds=int(st.secrets.get("BCRYPT_ROUNDS", 12)),
+        workers=int(st.secrets.get("BCRYPT_WORKERS", 2)),
+        max_pending=int(st.secrets.get("BCRYPT_MAX_PENDING", 32)),
+        timeout=float(st.secrets.get("BCRYPT_TIMEOUT", 15)),
+    )
+    # Queue depth and admission control, exported with the latency histograms
+    REGISTRY.register_collector(
+        "bcrypt_tasks", "gauge", "Password hashes and checks waiting for or running on a bcrypt worker",
+        lambda: {state: hasher.stats()[state] for state in ("queued", "running")}, label="state",
+    )
+    REGISTRY.register_collector(
+        "bcrypt_rejected_total", "counter", "Password hashes and checks turned away because the queue was full",
+        lambda: hasher.stats()["rejected"],
+    )
+    REGISTRY.register_collector(
+        "bcrypt_completed_total", "counter", "Password hashes and checks finished",
+        lambda: hasher.stats()["completed"],
+    )
+    return hasher
+
+def hash_password(password):
+    return _password_hasher().hash(password)
+
+def verify_password(stored_password, provided_password):
+    return _password_hasher().verify(stored_password, provided_password)
+
+@st.cache_resource
+def _user_id_cache():
+    return LRUTTLCache(
+        maxsize=int(st.secrets.get("USER_ID_CACHE_SIZE", 1024)),
+        ttl=float(st.secrets.get("USER_ID_CACHE_TTL", 600)),
+    )
+
+# Identity of the logged-in student, resolved once at login
+Principal = namedtuple("Principal", ["user_id", "username"])
+
+@timed("db")
+def get_user_id(username):
+    cache = _user_id_cache()
+    user_id = cache.get(username)
+    if user_id is not None:
+        return user_id
+
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT id FROM users WHERE username = %s", (username,))
+            row = cursor.fetchone()
+    finally:
+        conn.close()
+
+    if not row:
+        return None
+    cache.set(username, row["id"])
+    return row["id"]
+
+def current_user_id():
+    principal = st.session_state.get("principal")
+    if principal is None:
+        # Sessions that logged in before the principal existed
+        return get_user_id(st.session_state.username)
+    return principal.user_id
+
+def validate_user(username, password):
+    # Returns a Principal on success and None otherwise. Only the lookup counts
+    # as "db" time; the password check is timed under "bcrypt".
+    with timer("db", "validate_user"):
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT id, password FROM users WHERE username = %s", (username,))
+                row = cursor.fetchone()
+        finally:
+            conn.close()
+
+    if not row:
+        return None
+    if not verify_password(row["password"], password):
+        return None
+    _user_id_cache().set(username, row["id"])
+    return Principal(user_id=row["id"], username=username)
+
+def create_user(username, password):
+    # Hash before checking out a connection, so signups queued on bcrypt never
+    # hold pool connections; uq_users_username turns duplicates away
+    hashed_password = hash_password(password)
+    with timer("db", "create_user"):
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, hashed_password))
+                except storage_backend().integrity_error:
+                    return False
+                user_id = cursor.lastrowid
+            conn.commit()
+        finally:
+            conn.close()
+    _user_id_cache().set(username, user_id)
+    return True
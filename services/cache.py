@@ -0,0 +1,50 @@
+"""Process-wide caches shared by the services."""
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+class LRUTTLCache:
+    # Small thread-safe LRU with a per-entry time-to-live
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()      # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+@st.cache_resource
+def dashboard_cache():
+    return LRUTTLCache(
+        maxsize=int(st.secrets.get("DASHBOARD_CACHE_SIZE", 512)),
+        ttl=float(st.secrets.get("DASHBOARD_CACHE_TTL", 60)),
+    )
+
+def invalidate_dashboard(user_id):
+    dashboard_cache().invalidate(user_id)
@@ -0,0 +1,126 @@
+"""Per-user reads behind the dashboard page."""
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+import queries
+import scoring
+from services.cache import dashboard_cache
+from services.db import db_pool, run_query, write_behind
+from services.metrics import timed
+from services.models import get_cluster_profiles
+from services.querylog import current_query_log
+
+@timed("db")
+def _fetch_self_check_stats(cursor, user_id):
+    # One round trip for all three metric cards
+    cursor.execute(queries.SELF_CHECK_STATS, (user_id,))
+    row = cursor.fetchone()
+
+    if not row:
+        return 0, 0, 0
+    return int(row["total"]), int(row["low"]), int(row["high"])
+
+@timed("db")
+def _fetch_recent_clusters(cursor, user_id, profiles):
+    cursor.execute(queries.RECENT_CLUSTERS, (user_id,))
+    results = cursor.fetchall()
+
+    recent_clusters = []
+    for row in results:
+        cluster_num = int(row["cluster"])
+        pred_result = row["prediction_result"]
+        date_str = row["submitted_at"].strftime("%Y-%m-%d")
+
+        group = scoring.GROUP_LABELS.get(pred_result, "Mild")
+
+        profile = profiles.get(group, cluster_num)
+        if profile:
+            friendly_name, description = profile.name, profile.description
+        else:
+            friendly_name, description = f"{group} – Cluster {cluster_num}", "No description available."
+
+        recent_clusters.append({
+            "label": friendly_name,
+            "date": date_str,
+            "description": description
+        })
+
+    return recent_clusters
+
+@timed("db")
+def _fetch_latest_reflections(cursor, user_id):
+    cursor.execute(queries.LATEST_REFLECTIONS, (user_id,))
+    return list(cursor.fetchall())
+
+def get_self_check_stats(user_id):
+    return run_query(_fetch_self_check_stats, user_id)
+
+def get_recent_clusters(user_id):
+    return run_query(_fetch_recent_clusters, user_id, get_cluster_profiles())
+
+def get_latest_reflections(user_id):
+    return run_query(_fetch_latest_reflections, user_id)
+
+# Everything the dashboard page renders, fetched together
+DashboardSnapshot = namedtuple("DashboardSnapshot", ["total", "low", "high", "recent_clusters", "reflections"])
+
+@st.cache_resource
+def _dashboard_executor():
+    return ThreadPoolExecutor(
+        max_workers=int(st.secrets.get("DASHBOARD_WORKERS", 6)),
+        thread_name_prefix="campus-care-dashboard",
+    )
+
+# Each uncached load checks out one pooled connection per query
+FAN_OUT = 3
+
+@st.cache_resource
+def _dashboard_slots():
+    # Caps concurrent fan-outs so dashboards can never hold the whole pool;
+    # by default a third of MYSQL_POOL_MAX, leaving the rest for other pages
+    limit = st.secrets.get("DASHBOARD_CONCURRENCY")
+    if limit is None:
+        limit = db_pool().max_size // FAN_OUT
+    return threading.BoundedSemaphore(max(1, int(limit)))
+
+@timed("db")
+def load_dashboard(user_id):
+    # Reruns within the TTL are served from the per-user cache; the save_*
+    # helpers (and the write-behind queue once rows commit) invalidate it.
+    cache = dashboard_cache()
+    snapshot = cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    # Make sure this student's queued check-ins and reflections are visible;
+    # other students' rows are not waited for. If the writer is stuck the page
+    # still renders, but the snapshot is not cached.
+    flushed = write_behind().flush_user(user_id)
+
+    # The three reads run concurrently on separate pooled connections, so the
+    # page waits for the slowest query instead of the sum of all of them.
+    # Cached resources are resolved here, on the script thread.
+    pool = db_pool()
+    log = current_query_log()
+    profiles = get_cluster_profiles()
+    executor = _dashboard_executor()
+
+    with _dashboard_slots():
+        stats = executor.submit(run_query, _fetch_self_check_stats, user_id, pool=pool, query_log=log)
+        clusters = executor.submit(run_query, _fetch_recent_clusters, user_id, profiles, pool=pool, query_log=log)
+        reflections = executor.submit(run_query, _fetch_latest_reflections, user_id, pool=pool, query_log=log)
+
+        total, low, high = stats.result()
+        snapshot = DashboardSnapshot(
+            total=total,
+            low=low,
+            high=high,
+            recent_clusters=tuple(clusters.result()),
+            reflections=tuple(reflections.result()),
+        )
+    if flushed:
+        cache.set(user_id, snapshot)
+    return snapshot
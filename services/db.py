@@ -0,0 +1,439 @@
+"""Database connections, the write-behind queue and the startup schema check."""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+import pymysql
+import streamlit as st
+
+import migrations
+import storage
+from services.cache import invalidate_dashboard
+from services.metrics import timed, timer
+from services.querylog import LoggedCursor, current_query_log
+
+logger = logging.getLogger(__name__)
+
+@st.cache_resource
+def storage_backend():
+    # STORAGE_BACKEND picks MySQL (the default) or an embedded SQLite file; see storage.py
+    return storage.backend_from_settings(st.secrets.get)
+
+class PoolTimeoutError(Exception):
+    pass
+
+class SchemaOutOfDateError(Exception):
+    pass
+
+class PooledConnection:
+    # Proxy handed out by the pool; close() (or leaving a `with` block)
+    # checks the connection back in instead of tearing down the socket.
+    # With a query log, cursors record each statement in it.
+    def __init__(self, pool, conn, query_log=None):
+        self._pool = pool
+        self._conn = conn
+        self._query_log = query_log
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise pymysql.err.InterfaceError("Connection already returned to the pool")
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        if self._conn is None:
+            raise pymysql.err.InterfaceError("Connection already returned to the pool")
+        cursor = self._conn.cursor(*args, **kwargs)
+        return cursor if self._query_log is None else LoggedCursor(cursor, self._query_log)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ConnectionPool:
+    def __init__(self, connect, min_size=1, max_size=5, acquire_timeout=10.0, health_check_after=30.0):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_after = health_check_after
+        self._idle = deque()        # (connection, last checked-in time)
+        self._size = 0              # idle + checked out
+        self._cond = threading.Condition()
+
+        # Pay the TLS handshake for the minimum pool up front
+        for _ in range(min_size):
+            self._size += 1
+            try:
+                self._idle.append((self._connect(), time.monotonic()))
+            except Exception:
+                self._size -= 1
+                self.close()
+                raise
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def acquire(self, timeout=None):
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(f"No database connection available within {timeout:.1f}s")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    conn, last_used = None, None
+                    self._size += 1
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            # Only ping connections that sat idle long enough for the server to drop them
+            if time.monotonic() - last_used < self.health_check_after:
+                return conn
+            try:
+                conn.ping(reconnect=True)
+                return conn
+            except Exception:
+                self._discard(conn)
+
+    def release(self, conn):
+        # Connections run in autocommit (see storage.py), so a plain read leaves
+        # no transaction behind and needs no ROLLBACK round trip. One a caller
+        # left open is rolled back so the next borrower starts clean.
+        if getattr(conn, "in_transaction", True):
+            try:
+                conn.rollback()
+            except Exception:
+                self._discard(conn)
+                return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def connection(self, timeout=None, query_log=None):
+        return PooledConnection(self, self.acquire(timeout), query_log)
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            self._discard(conn)
+
+@st.cache_resource
+def db_pool():
+    return ConnectionPool(
+        storage_backend().connect,
+        min_size=int(st.secrets.get("MYSQL_POOL_MIN", 1)),
+        max_size=int(st.secrets.get("MYSQL_POOL_MAX", 5)),
+        acquire_timeout=float(st.secrets.get("MYSQL_POOL_TIMEOUT", 10)),
+        health_check_after=float(st.secrets.get("MYSQL_POOL_HEALTH_CHECK_AFTER", 30)),
+    )
+
+@timed("db", "acquire_connection")
+def get_db_connection(pool=None, query_log=None):
+    # Callers keep using conn.close() / `with conn:`; both check the connection back in.
+    # Statements go to this rerun's query log; worker threads have no script
+    # context, so callers resolve the pool and log on the script thread and pass them
+    pool = pool if pool is not None else db_pool()
+    return pool.connection(query_log=query_log if query_log is not None else current_query_log())
+
+def insert_statements(backend):
+    # Statements run for every row queued for a table, in order and in the same
+    # transaction. Reflections also upsert the latest-per-module summary row.
+    return {
+        "self_check_logs": ("""
+            INSERT INTO self_check_logs (user_id, score, risk_level)
+            VALUES (%s, %s, %s)
+        """,),
+        "user_reflections": ("""
+            INSERT INTO user_reflections (user_id, module_name, reflection)
+            VALUES (%s, %s, %s)
+        """, f"""
+            INSERT INTO latest_user_reflections (user_id, module_name, reflection)
+            VALUES (%s, %s, %s)
+            {backend.upsert(("user_id", "module_name"), {"reflection": None, "created_at": "CURRENT_TIMESTAMP"})}
+        """),
+        "high_risk_responses": ("""
+            INSERT INTO high_risk_responses (
+                user_id, age, study_hours, coursework_pressure, academic_workload,
+                sleep_hours, physical_activity, isolation, financial_stress,
+                cocurricular, suicidal_thoughts, prediction_result, cluster
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """,),
+    }
+
+class WriteBehindQueue:
+    # Background writer: rows are queued by the script thread and committed in
+    # batches (one executemany per table) when batch_size rows are pending or
+    # flush_interval seconds have passed, whichever comes first. flush_user()
+    # ends the current batch window early and waits for one user's rows only.
+    _STOP = object()
+    _FLUSH = object()
+
+    def __init__(self, pool, backend, enabled=True, max_queue=1000, batch_size=100,
+                 flush_interval=1.0, max_retries=3, retry_backoff=0.5, on_commit=None):
+        self.pool = pool
+        self.statements = insert_statements(backend)
+        self.error = backend.error
+        self.is_transient = backend.is_transient
+        self.on_commit = on_commit      # called with each user_id whose rows were committed
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending_users = {}            # user_id -> rows queued and not yet written
+        self._written = threading.Condition()
+        self._closed = False
+        self._thread = None
+        if enabled:
+            self._thread = threading.Thread(target=self._run, name="campus-care-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def submit(self, table, row):
+        if table not in self.statements:
+            raise ValueError(f"Unknown table for write-behind insert: {table}")
+        if not self.enabled or self._closed:
+            self._write([(table, row)])
+            return
+        # Counted before the put so the writer can never finish the row first
+        self._track([(table, row)], 1)
+        try:
+            self._queue.put((table, row), timeout=0.5)
+        except queue.Full:
+            # Backpressure: the writer is behind, so pay for this row inline
+            self._track([(table, row)], -1)
+            self._write([(table, row)])
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _track(self, batch, delta):
+        # Every queued table has user_id as its first column
+        with self._written:
+            for _, row in batch:
+                count = self._pending_users.get(row[0], 0) + delta
+                if count > 0:
+                    self._pending_users[row[0]] = count
+                else:
+                    self._pending_users.pop(row[0], None)
+            if delta < 0:
+                self._written.notify_all()
+
+    def _wake(self):
+        # Ends the writer's batch window so queued rows are written now
+        try:
+            self._queue.put_nowait(self._FLUSH)
+        except queue.Full:
+            pass    # a full queue is written in full batches without waiting anyway
+
+    def flush_user(self, user_id, timeout=5.0):
+        # Waits until the rows this user queued so far have been written (or
+        # given up on); other students' rows are not waited for. Returns False
+        # on timeout.
+        with self._written:
+            if not self._pending_users.get(user_id):
+                return True
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        self._wake()
+        with self._written:
+            return self._written.wait_for(lambda: not self._pending_users.get(user_id), timeout)
+
+    def flush(self):
+        # Blocks until everything queued so far has been committed (or given up on)
+        if self._thread is not None and self._thread.is_alive():
+            self._wake()
+            self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        # Anything the worker did not get to is written synchronously
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP and item is not self._FLUSH:
+                leftovers.append(item)
+            self._queue.task_done()
+        if leftovers:
+            try:
+                self._write(leftovers)
+            finally:
+                self._track(leftovers, -1)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                break
+            if item is self._FLUSH:
+                self._queue.task_done()     # nothing waiting to be batched
+                continue
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    self._queue.task_done()
+                    stop = True
+                    break
+                if item is self._FLUSH:
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            try:
+                with timer("db", "write_behind_batch"):
+                    self._write(batch)
+            except Exception:
+                logger.exception("Write-behind flush failed; %d rows lost", len(batch))
+            finally:
+                self._track(batch, -1)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        rows_by_table = {}
+        for table, row in batch:
+            rows_by_table.setdefault(table, []).append(row)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                conn = self.pool.connection()
+                try:
+                    conn.begin()    # the batch commits (or fails) as a whole
+                    with conn.cursor() as cursor:
+                        for table, rows in rows_by_table.items():
+                            for statement in self.statements[table]:
+                                cursor.executemany(statement, rows)
+                    conn.commit()
+                finally:
+                    conn.close()
+                self._notify_committed(batch)
+                return
+            except (PoolTimeoutError, self.error) as e:
+                if not isinstance(e, PoolTimeoutError) and not self.is_transient(e):
+                    # A bad row must not take the rest of the batch down with it
+                    if len(batch) == 1:
+                        logger.error("Dropping row for %s: %s", batch[0][0], e)
+                        return
+                    for item in batch:
+                        self._write([item])
+                    return
+                if attempt == self.max_retries:
+                    logger.error("Dropping %d queued rows after %d attempts: %s", len(batch), attempt + 1, e)
+                    return
+                logger.warning("Write-behind flush failed (attempt %d), retrying: %s", attempt + 1, e)
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def _notify_committed(self, batch):
+        if self.on_commit is None:
+            return
+        # Every queued table has user_id as its first column
+        for user_id in {row[0] for _, row in batch}:
+            try:
+                self.on_commit(user_id)
+            except Exception:
+                logger.exception("Write-behind commit callback failed")
+
+@st.cache_resource
+def write_behind():
+    return WriteBehindQueue(
+        db_pool(),
+        storage_backend(),
+        enabled=bool(st.secrets.get("WRITE_BEHIND", True)),
+        max_queue=int(st.secrets.get("WRITE_BEHIND_MAX_QUEUE", 1000)),
+        batch_size=int(st.secrets.get("WRITE_BEHIND_BATCH_SIZE", 100)),
+        flush_interval=float(st.secrets.get("WRITE_BEHIND_FLUSH_INTERVAL", 1.0)),
+        on_commit=invalidate_dashboard,
+    )
+
+def run_query(fetch, *args, pool=None, query_log=None):
+    # Runs fetch(cursor, *args) on a pooled connection
+    conn = get_db_connection(pool, query_log)
+    try:
+        with conn.cursor() as cursor:
+            return fetch(cursor, *args)
+    finally:
+        conn.close()
+
+@st.cache_resource
+def ensure_schema():
+    # Runs once per process: applies pending migrations when AUTO_MIGRATE is set
+    # and warns about any index the per-user queries rely on that is missing.
+    # An out-of-date schema is refused: the writes and dashboard queries need
+    # every table (e.g. latest_user_reflections). Failures are raised, not
+    # cached, so the next rerun checks again.
+    try:
+        backend = storage_backend()
+        conn = get_db_connection()
+        try:
+            # The version and the index list are each read once (migrate()
+            # reads the version under its lock)
+            if st.secrets.get("AUTO_MIGRATE", False):
+                applied = migrations.migrate(conn, backend)
+                if applied:
+                    logger.info("Applied schema migrations %s", applied)
+                version = migrations.MIGRATIONS[-1].version
+            else:
+                version = migrations.current_version(conn, backend)
+            missing = migrations.missing_indexes(conn, backend)
+        finally:
+            conn.close()
+    except Exception:
+        logger.exception("Schema check failed")
+        raise
+    if version < migrations.MIGRATIONS[-1].version:
+        message = (f"Schema is at version {version} of {migrations.MIGRATIONS[-1].version}; "
+                   "run `python migrations.py` or set AUTO_MIGRATE")
+        logger.error(message)
+        raise SchemaOutOfDateError(message)
+    for table, name in missing:
+        logger.warning("Missing index %s on %s; run `python migrations.py`", name, table)
+    return missing
@@ -0,0 +1,226 @@
+"""Latency histograms for pages, DB helpers and the model, in Prometheus format.
+
+    @timed("db")
+    def validate_user(...): ...
+
+    with timer("model", "predict_one"):
+        prediction = model.predict_one(row)
+
+Every family becomes a campus_care_<family>_seconds histogram and a
+campus_care_<family>_errors_total counter, labelled by name. start_exporter()
+serves them on a local port and/or rewrites a text file for a node_exporter
+textfile collector; sampled_profile() keeps cProfile dumps of slow reruns.
+register_collector() adds gauges and counters read at export time, such as
+the bcrypt pool's queue depth (services/auth.py).
+The registry is per process, like the app's other cached resources.
+"""
+import cProfile
+import functools
+import http.server
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+FAMILIES = {
+    "page": "Time to run one page of the app (a full script run)",
+    "db": "Time spent in a database helper",
+    "model": "Time spent scoring or assigning clusters",
+    "bcrypt": "Time to hash or check a password, including the wait for a worker",
+}
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)     # per bucket, made cumulative on export
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+
+class MetricsRegistry:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}               # (family, name) -> Histogram
+        self._collectors = {}               # metric -> (type, help, collect, label)
+
+    def observe(self, family, name, seconds, failed=False):
+        with self._lock:
+            histogram = self._histograms.get((family, name))
+            if histogram is None:
+                histogram = self._histograms[(family, name)] = Histogram(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram.counts[i] += 1
+                    break
+            histogram.count += 1
+            histogram.sum += seconds
+            if failed:
+                histogram.errors += 1
+
+    def snapshot(self):
+        # {(family, name): (cumulative bucket counts, count, sum, errors)}
+        with self._lock:
+            result = {}
+            for key, h in self._histograms.items():
+                cumulative, running = [], 0
+                for n in h.counts:
+                    running += n
+                    cumulative.append(running)
+                result[key] = (cumulative, h.count, h.sum, h.errors)
+            return result
+
+    def register_collector(self, metric, kind, help, collect, label=None):
+        # A gauge or counter read at export time: collect() returns a number, or
+        # {label value: number} when label is given. Re-registering replaces it.
+        with self._lock:
+            self._collectors[metric] = (kind, help, collect, label)
+
+    def _render_collectors(self):
+        with self._lock:
+            collectors = sorted(self._collectors.items())
+        lines = []
+        for metric, (kind, help, collect, label) in collectors:
+            try:
+                values = collect()
+            except Exception:
+                logger.exception("Metrics collector %s failed", metric)
+                continue
+            name = f"campus_care_{metric}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            if label is None:
+                lines.append(f"{name} {values}")
+            else:
+                for value, n in sorted(values.items()):
+                    lines.append(f'{name}{{{label}="{_escape(value)}"}} {n}')
+        return lines
+
+    def render_prometheus(self):
+        snapshot = self.snapshot()
+        lines = self._render_collectors()
+        for family in sorted({family for family, _ in snapshot}):
+            rows = sorted((name, data) for (f, name), data in snapshot.items() if f == family)
+            metric = f"campus_care_{family}_seconds"
+            lines.append(f"# HELP {metric} {FAMILIES.get(family, family)}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, (cumulative, count, total, _) in rows:
+                label = _escape(name)
+                for bound, n in zip(self.buckets, cumulative):
+                    lines.append(f'{metric}_bucket{{name="{label}",le="{bound:g}"}} {n}')
+                lines.append(f'{metric}_bucket{{name="{label}",le="+Inf"}} {count}')
+                lines.append(f'{metric}_sum{{name="{label}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{name="{label}"}} {count}')
+            errors = f"campus_care_{family}_errors_total"
+            lines.append(f"# HELP {errors} Calls that raised, by name")
+            lines.append(f"# TYPE {errors} counter")
+            for name, (_, _, _, failed) in rows:
+                lines.append(f'{errors}{{name="{_escape(name)}"}} {failed}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+REGISTRY = MetricsRegistry()
+
+@contextmanager
+def timer(family, name, registry=REGISTRY):
+    # Streamlit's rerun/stop signals derive from BaseException and are not errors
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        registry.observe(family, name, time.perf_counter() - started, failed)
+
+def timed(family, name=None, registry=REGISTRY):
+    def decorate(fn):
+        label = name or fn.__name__.lstrip("_")
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(family, label, registry):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@contextmanager
+def sampled_profile(name, rate, slow_seconds, directory):
+    # Profiles a `rate` share of the wrapped runs and keeps a .prof dump of
+    # those that took at least slow_seconds (view with snakeviz or pstats)
+    profiler = None
+    if rate > 0 and random.random() < rate:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            profiler = None     # another profiler is already active on this thread
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            if elapsed >= slow_seconds:
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{elapsed * 1000:.0f}ms.prof")
+                profiler.dump_stats(path)
+                logger.info("Slow %s run (%.0f ms) profiled to %s", name, elapsed * 1000, path)
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _write_file(registry, path, interval):
+    while True:
+        try:
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(registry.render_prometheus())
+            os.replace(tmp, path)    # scrapers never see a half-written file
+        except OSError:
+            logger.exception("Could not write metrics to %s", path)
+        time.sleep(interval)
+
+def start_exporter(port=None, path=None, interval=15.0, host="127.0.0.1", registry=REGISTRY):
+    # Call once per process; serves /metrics on host:port and/or rewrites path
+    # every `interval` seconds, each on a daemon thread
+    if port:
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        try:
+            server = http.server.ThreadingHTTPServer((host, int(port)), handler)
+        except OSError:
+            logger.exception("Could not serve metrics on %s:%s", host, port)
+        else:
+            threading.Thread(target=server.serve_forever, name="campus-care-metrics-http", daemon=True).start()
+            logger.info("Serving metrics on http://%s:%s/metrics", host, port)
+    if path:
+        threading.Thread(
+            target=_write_file, args=(registry, path, interval), name="campus-care-metrics-file", daemon=True,
+        ).start()
@@ -0,0 +1,30 @@
+"""The stacking model and the cluster profiles, loaded once per process."""
+import streamlit as st
+
+import scoring
+from services.metrics import timed
+
+@st.cache_resource
+def _model_registry():
+    return scoring.ModelRegistry(warm=bool(st.secrets.get("MODEL_WARMUP", True)))
+
+def get_model(path=None):
+    return _model_registry().get(path or scoring.MODEL_PATH)
+
+def get_compiled_model(path=None):
+    return _model_registry().get_compiled(path or scoring.MODEL_PATH)
+
+@st.cache_resource
+def _cluster_store():
+    return scoring.ClusterProfileStore(scoring.CLUSTER_PROFILES_PATH)
+
+def get_cluster_profiles():
+    return _cluster_store().get()
+
+@timed("model")
+def assign_cluster(user_vector, group_label):
+    return get_cluster_profiles().engine(group_label).assign(user_vector)
+
+@timed("model")
+def assign_clusters(user_vectors, group_labels):
+    return scoring.assign_clusters(get_cluster_profiles(), user_vectors, group_labels)
@@ -0,0 +1,188 @@
+"""Per-rerun SQL log: every statement a rerun sends, with slow and repeated ones flagged.
+
+get_db_connection() wraps each cursor in a LoggedCursor that records the
+normalised statement, its parameter count, the round-trip time and the rows
+returned (or affected) in the rerun's QueryLog. Drivers that report no
+rowcount for a SELECT (sqlite3 says -1) get the rows counted as they are
+fetched. Statements slower than
+SQL_SLOW_SECONDS and reads (normalised) sent SQL_REPEAT_THRESHOLD or more
+times in one rerun (the N+1 pattern) are logged as warnings; with
+SQL_DEBUG_PANEL set the sidebar shows the rerun's summary.
+"""
+import functools
+import logging
+import re
+import threading
+import time
+from collections import namedtuple
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY = "_query_log"
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+@functools.lru_cache(maxsize=512)
+def normalize(sql):
+    # Literals and placeholders become ?, IN lists collapse and whitespace is
+    # squeezed, so the same statement with different values groups together
+    text = _STRING.sub("?", sql)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("IN (?)", text)
+    return _SPACE.sub(" ", text).strip()
+
+QueryRecord = namedtuple("QueryRecord", ["statement", "params", "seconds", "rows", "slow"])
+
+# One line of the per-rerun summary, grouped by normalised statement
+StatementSummary = namedtuple("StatementSummary", ["statement", "calls", "total_seconds", "max_seconds", "rows", "slow", "repeated"])
+
+class QueryLog:
+    def __init__(self, slow_seconds=0.2, repeat_threshold=2):
+        self.slow_seconds = slow_seconds
+        self.repeat_threshold = repeat_threshold
+        self.records = []
+        self._calls = {}            # statement -> count this rerun
+        self._lock = threading.Lock()   # the dashboard reads record from worker threads
+
+    def record(self, sql, params, seconds, rows):
+        # Returns the record's index so rows fetched later can be added to it
+        statement = normalize(sql)
+        slow = seconds >= self.slow_seconds
+        with self._lock:
+            index = len(self.records)
+            self.records.append(QueryRecord(statement, _param_count(params), seconds, rows, slow))
+            calls = self._calls[statement] = self._calls.get(statement, 0) + 1
+        if slow:
+            logger.warning("Slow query (%.0f ms, %s rows): %s", seconds * 1000, "?" if rows is None else rows, statement)
+        if calls == self.repeat_threshold and _is_read(statement):
+            logger.warning("Query repeated %d times in one rerun (possible N+1): %s", calls, statement)
+        return index
+
+    def add_rows(self, index, rows):
+        with self._lock:
+            record = self.records[index]
+            self.records[index] = record._replace(rows=(record.rows or 0) + rows)
+
+    def summary(self):
+        with self._lock:
+            records = list(self.records)
+        grouped = {}
+        for record in records:
+            grouped.setdefault(record.statement, []).append(record)
+        rows = [
+            StatementSummary(
+                statement=statement,
+                calls=len(group),
+                total_seconds=sum(r.seconds for r in group),
+                max_seconds=max(r.seconds for r in group),
+                rows=sum(r.rows for r in group if r.rows is not None and r.rows >= 0),
+                slow=any(r.slow for r in group),
+                repeated=len(group) >= self.repeat_threshold and _is_read(statement),
+            )
+            for statement, group in grouped.items()
+        ]
+        return sorted(rows, key=lambda row: row.total_seconds, reverse=True)
+
+    @property
+    def total_seconds(self):
+        with self._lock:
+            return sum(r.seconds for r in self.records)
+
+def _is_read(statement):
+    # N+1 is a read pattern; repeated writes and DDL (e.g. migrations) are not flagged
+    return statement.upper().startswith(("SELECT", "WITH"))
+
+def _param_count(params):
+    if params is None:
+        return 0
+    if isinstance(params, (list, tuple, dict)):
+        return len(params)
+    return 1
+
+class LoggedCursor:
+    # Cursor proxy that times execute()/executemany(); with pymysql's buffered
+    # cursors the result set has arrived by the time execute() returns. When
+    # the driver has no rowcount (-1), fetched rows are counted instead.
+    def __init__(self, cursor, log):
+        self._cursor = cursor
+        self._log = log
+        self._counting = None       # index of the record fetched rows are added to
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._count(1)
+            yield row
+
+    def _record(self, query, args, seconds):
+        rows = self._cursor.rowcount
+        if rows is None or rows < 0:
+            self._counting = self._log.record(query, args, seconds, None)
+        else:
+            self._counting = None
+            self._log.record(query, args, seconds, rows)
+
+    def _count(self, rows):
+        if self._counting is not None and rows:
+            self._log.add_rows(self._counting, rows)
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            self._record(query, args, time.perf_counter() - started)
+
+    def executemany(self, query, args):
+        args = list(args)
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            self._record(query, args[0] if args else None, time.perf_counter() - started)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._count(1)
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count(len(rows))
+        return rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+def begin_rerun():
+    # Called at the top of every script run; the previous rerun's log is dropped
+    st.session_state[SESSION_KEY] = QueryLog(
+        slow_seconds=float(st.secrets.get("SQL_SLOW_SECONDS", 0.2)),
+        repeat_threshold=int(st.secrets.get("SQL_REPEAT_THRESHOLD", 2)),
+    )
+
+def current_query_log():
+    # None off the script thread (resolve it there and pass it along) and
+    # before begin_rerun() has run
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(SESSION_KEY)
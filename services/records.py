@@ -0,0 +1,25 @@
+"""Writes for check-ins, high-risk responses and reflections."""
+from services.cache import invalidate_dashboard
+from services.db import write_behind
+from services.metrics import timed
+
+@timed("db")
+def save_high_risk_response(user_id, age, study_hours, coursework_pressure, academic_workload,
+                             sleep_hours, physical_activity, isolation, financial_stress,
+                             cocurricular, suicidal_binary, prediction_result, cluster):
+    write_behind().submit("high_risk_responses", (
+        user_id, age, study_hours, coursework_pressure, academic_workload,
+        sleep_hours, physical_activity, isolation, financial_stress,
+        cocurricular, suicidal_binary, int(prediction_result), cluster
+    ))
+    invalidate_dashboard(user_id)
+
+@timed("db")
+def save_self_check_visit(user_id, total_score, risk_level):
+    write_behind().submit("self_check_logs", (user_id, total_score, risk_level))
+    invalidate_dashboard(user_id)
+
+@timed("db")
+def save_reflection(user_id, module_name, reflection):
+    write_behind().submit("user_reflections", (user_id, module_name, reflection))
+    invalidate_dashboard(user_id)
@@ -0,0 +1,505 @@
+"""Storage backends: MySQL (the default) and an embedded SQLite database.
+
+Both hand out DB-API connections with the same surface as pymysql with a
+DictCursor: %s placeholders, rows as dicts, cursors usable as context
+managers and a ping(). Everything written in SQL (queries.py, migrations.py,
+the services) therefore runs on either; the few statements whose syntax
+differs (auto-increment ids, table options, index DDL, upserts and query
+plans) are built through the backend.
+
+    STORAGE_BACKEND = "sqlite"              # default "mysql"
+    SQLITE_PATH = "campus_care.sqlite3"
+    MYSQL_PREPARED_STATEMENTS = true        # needs mysql-connector-python
+
+SQLite runs in WAL mode, so the script threads keep reading while the
+write-behind thread commits; it suits development, CI and benchmark runs,
+and small single-server deployments.
+
+The app sends a small fixed set of statements. pymysql interpolates them
+client-side, so MySQL parses every one afresh. With MYSQL_PREPARED_STATEMENTS
+(and mysql-connector-python installed) each pooled connection prepares a
+statement on its first use and afterwards only executes it over the binary
+protocol; without the driver, or for statements the server cannot prepare,
+queries go through the text protocol as before. The driver resets a
+statement before every execute, one extra round trip, so measure with
+benchmarks/statements.py before turning it on against a distant server.
+That reset would make batched writes cost two round trips a row, so
+executemany() INSERTs (the write-behind batches) skip preparing and go out
+as a single multi-row INSERT over the text protocol.
+SQLite needs none of this: sqlite3 keeps each connection's statements
+compiled in its own statement cache.
+"""
+import datetime
+import functools
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+import pymysql
+import pymysql.cursors
+from pymysql.constants import SERVER_STATUS
+
+logger = logging.getLogger(__name__)
+
+
+# Named lock taken while migrating (MySQL GET_LOCK)
+MIGRATION_LOCK = "campus_care_migrations"
+
+
+def _mysql_connector():
+    try:
+        import mysql.connector
+    except ImportError:
+        return None
+    return mysql.connector
+
+
+# Statements worth preparing; DDL, EXPLAIN and the like use the text protocol
+_PREPARABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+ER_UNSUPPORTED_PS = 1295
+
+# Errors worth retrying: lock wait timeout and deadlock (InnoDB rolled the
+# statement or transaction back), and losing or failing to reach the server
+# (2055 is mysql-connector's lost-connection-with-system-error). Everything
+# else (unknown columns, denied privileges, failed CHECKs, ...) fails the
+# same way every time.
+_TRANSIENT_ERRNOS = frozenset({1205, 1213, 2002, 2003, 2006, 2013, 2055})
+
+
+def _errno(error):
+    # mysql-connector sets .errno; pymysql passes the code as the first arg
+    errno = getattr(error, "errno", None)
+    if errno is None and error.args and isinstance(error.args[0], int):
+        errno = error.args[0]
+    return errno
+
+
+class PreparedStatementCursor:
+    # pymysql-style cursor over a PreparedStatementConnection. Results are
+    # read in full by execute(), as pymysql's buffered cursors do, so the
+    # connection is free for the next statement straight away.
+    def __init__(self, connection):
+        self._connection = connection
+        self._rows = []
+        self._position = 0
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, sql, params=None):
+        cursor, operation = self._connection.statement(sql)
+        try:
+            cursor.execute(operation, params or ())
+        except self._connection.error as e:
+            if getattr(e, "errno", None) != ER_UNSUPPORTED_PS:
+                raise
+            cursor, operation = self._connection.unpreparable(sql)
+            cursor.execute(operation, params or ())
+        self.description = cursor.description
+        self._rows = cursor.fetchall() if cursor.with_rows else []
+        self._position = 0
+        self.rowcount = len(self._rows) if cursor.with_rows else cursor.rowcount
+        self.lastrowid = cursor.lastrowid
+        return self.rowcount
+
+    def executemany(self, sql, seq_of_params):
+        # INSERTs go through the text cursor, which sends the batch as one
+        # multi-row INSERT; per-row prepared executes would cost a reset and an
+        # execute round trip for every row. Anything else executes per row.
+        seq_of_params = list(seq_of_params)
+        if sql.lstrip().upper().startswith("INSERT"):
+            cursor = self._connection._text()
+            cursor.executemany(sql, seq_of_params)
+            self.description = None
+            self._rows = []
+            self._position = 0
+            self.rowcount = cursor.rowcount if seq_of_params else 0
+            self.lastrowid = cursor.lastrowid
+            return self.rowcount
+        total = 0
+        for params in seq_of_params:
+            self.execute(sql, params)
+            total += max(self.rowcount, 0)
+        self.rowcount = total
+        return total
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        self._position += 1
+        return self._rows[self._position - 1]
+
+    def fetchmany(self, size=1):
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PreparedStatementConnection:
+    # mysql-connector connection that keeps one prepared cursor per distinct
+    # statement, so the server parses each of them once per connection
+    def __init__(self, conn, error):
+        self._conn = conn
+        self.error = error
+        self._prepared = {}             # sql -> (prepared cursor, the sql it was prepared from)
+        self._unpreparable = set()
+        self._text_cursor = None
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self):
+        return PreparedStatementCursor(self)
+
+    def begin(self):
+        self._conn.start_transaction()
+
+    def statement(self, sql):
+        # (cursor, operation) to execute sql with. mysql-connector re-prepares
+        # unless it is handed the very string object it prepared, so cached
+        # statements come back with that object.
+        entry = self._prepared.get(sql)
+        if entry is not None:
+            return entry
+        if sql in self._unpreparable or not sql.lstrip().upper().startswith(_PREPARABLE):
+            return self._text(), sql
+        entry = self._prepared[sql] = (self._conn.cursor(prepared=True, dictionary=True), sql)
+        return entry
+
+    def unpreparable(self, sql):
+        cursor, _ = self._prepared.pop(sql)
+        cursor.close()
+        self._unpreparable.add(sql)
+        logger.info("Server cannot prepare this statement; using the text protocol: %s", " ".join(sql.split())[:120])
+        return self._text(), sql
+
+    def _text(self):
+        if self._text_cursor is None:
+            self._text_cursor = self._conn.cursor(dictionary=True, buffered=True)
+        return self._text_cursor
+
+    def ping(self, reconnect=True):
+        # A reconnect opens a new session, which has none of our statements
+        session = self._conn.connection_id
+        self._conn.ping(reconnect=reconnect)
+        if self._conn.connection_id != session:
+            self._prepared.clear()
+            self._text_cursor = None
+
+    def close(self):
+        for cursor, _ in self._prepared.values():
+            try:
+                cursor.close()      # deallocates the server-side statement
+            except Exception:
+                pass
+        self._prepared.clear()
+        self._conn.close()
+
+
+class MySQLConnection(pymysql.connections.Connection):
+    # in_transaction as on sqlite3 and mysql-connector connections, read from
+    # the status flags of the server's last reply (no round trip)
+    @property
+    def in_transaction(self):
+        return bool(self.server_status is not None and self.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS)
+
+
+class MySQLBackend:
+    name = "mysql"
+    auto_id = "INT AUTO_INCREMENT PRIMARY KEY"
+    table_options = "ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+
+    def __init__(self, host, port=3306, user=None, password=None, database=None, ssl_ca=None, timeout=10,
+                 prepared_statements=False):
+        self.settings = dict(host=host, port=port, user=user, password=password, database=database)
+        self.ssl_ca = ssl_ca
+        self.timeout = timeout
+        self.connector = _mysql_connector() if prepared_statements else None
+        if prepared_statements and self.connector is None:
+            logger.warning("MYSQL_PREPARED_STATEMENTS needs mysql-connector-python; using pymysql")
+        if self.connector is not None:
+            self.error = self.connector.Error
+            self.integrity_error = self.connector.errors.IntegrityError
+        else:
+            self.error = pymysql.err.MySQLError
+            self.integrity_error = pymysql.err.IntegrityError
+
+    def is_transient(self, error):
+        return isinstance(error, self.error) and _errno(error) in _TRANSIENT_ERRNOS
+
+    @classmethod
+    def from_settings(cls, get):
+        # Full TLS verification with the CA from MYSQL_SSL_CA, or MYSQL_SSL_CA_PEM
+        # written to a temporary file
+        ca_pem = get("MYSQL_SSL_CA_PEM")
+        ca_path = get("MYSQL_SSL_CA")
+        if ca_pem and not ca_path:
+            ca_path = os.path.join(tempfile.gettempdir(), "do-ca.pem")
+            if not os.path.exists(ca_path):
+                with open(ca_path, "w", encoding="utf-8") as f:
+                    f.write(ca_pem)
+        return cls(
+            host=get("MYSQL_HOST"),
+            port=int(get("MYSQL_PORT", 3306)),
+            user=get("MYSQL_USER"),
+            password=get("MYSQL_PASS"),
+            database=get("MYSQL_DB"),
+            ssl_ca=ca_path,
+            prepared_statements=bool(get("MYSQL_PREPARED_STATEMENTS", False)),
+        )
+
+    def connect(self):
+        if self.connector is not None:
+            tls = dict(ssl_ca=self.ssl_ca, ssl_verify_cert=True, ssl_verify_identity=True) if self.ssl_ca else {}
+            conn = self.connector.connect(**self.settings, **tls, connection_timeout=self.timeout, autocommit=True)
+            return PreparedStatementConnection(conn, self.error)
+        # Autocommit: reads need no transaction to end, and writers that need
+        # one call conn.begin()
+        return MySQLConnection(
+            **self.settings,
+            autocommit=True,
+            cursorclass=pymysql.cursors.DictCursor,
+            ssl={"ca": self.ssl_ca} if self.ssl_ca else None,
+            connect_timeout=self.timeout,
+            read_timeout=self.timeout,
+            write_timeout=self.timeout,
+        )
+
+    @contextmanager
+    def migration_lock(self, conn, timeout=60):
+        # A named lock held by this session, so one process migrates at a time.
+        # DDL commits implicitly, so a transaction could not do this.
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (MIGRATION_LOCK, timeout))
+            acquired = cursor.fetchone()["acquired"]
+        if acquired != 1:
+            raise TimeoutError(f"Another process held the migration lock for over {timeout}s")
+        try:
+            yield
+        finally:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT RELEASE_LOCK(%s) AS released", (MIGRATION_LOCK,))
+                cursor.fetchall()
+
+    def existing_indexes(self, cursor):
+        cursor.execute("""
+            SELECT TABLE_NAME AS table_name, INDEX_NAME AS index_name
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+        """)
+        return {(row["table_name"], row["index_name"]) for row in cursor.fetchall()}
+
+    def create_index(self, cursor, table, name, columns, unique=False):
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        cursor.execute(f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(columns)})")
+
+    def upsert(self, key, assignments):
+        # ON DUPLICATE KEY clause; assignments maps column -> SQL expression,
+        # or None to take the value being inserted
+        return "ON DUPLICATE KEY UPDATE " + ", ".join(
+            f"{column} = {expression or f'VALUES({column})'}" for column, expression in assignments.items()
+        )
+
+    def plan_issues(self, cursor, sql, params):
+        # Base-table accesses in the EXPLAIN output that do not use an index
+        cursor.execute("EXPLAIN " + sql, params)
+        issues = []
+        for row in cursor.fetchall():
+            table = row.get("table") or ""
+            if table.startswith("<"):
+                continue    # derived / materialised subquery results
+            extra = row.get("Extra") or ""
+            if row.get("type") is None and ("no matching row" in extra or "Impossible WHERE" in extra):
+                continue    # optimizer already proved the lookup empty via the index
+            if row.get("type") == "ALL" or row.get("key") is None:
+                issues.append(f"{table}: type={row.get('type')} key={row.get('key')} ({extra})")
+        return issues
+
+
+_PLACEHOLDER = re.compile(r"%s")
+
+
+@functools.lru_cache(maxsize=256)
+def _qmark(sql):
+    # Returns the same string object for the same statement, which is what
+    # sqlite3's statement cache is keyed on
+    return _PLACEHOLDER.sub("?", sql)
+
+
+class SQLiteBusyError(sqlite3.OperationalError):
+    # Another connection held the lock past the busy timeout. Unlike the other
+    # OperationalErrors (no such table, syntax errors, ...) it is worth retrying.
+    pass
+
+
+# SQLITE_BUSY and SQLITE_LOCKED; extended codes keep these in the low byte
+_BUSY_CODES = (5, 6)
+
+
+def _raise_busy(e):
+    # Re-raises a busy/locked OperationalError as SQLiteBusyError; call from an except block
+    code = getattr(e, "sqlite_errorcode", None)
+    busy = code & 0xFF in _BUSY_CODES if code is not None else "locked" in str(e)
+    if not busy:
+        raise e
+    error = SQLiteBusyError(*e.args)
+    error.sqlite_errorcode = code
+    error.sqlite_errorname = getattr(e, "sqlite_errorname", None)
+    raise error from e
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    # pymysql-style cursor: %s placeholders and `with conn.cursor() as cursor:`
+    def execute(self, sql, params=()):
+        try:
+            return super().execute(_qmark(sql), params or ())
+        except sqlite3.OperationalError as e:
+            _raise_busy(e)
+
+    def executemany(self, sql, seq_of_params):
+        try:
+            return super().executemany(_qmark(sql), seq_of_params)
+        except sqlite3.OperationalError as e:
+            _raise_busy(e)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SQLiteConnection(sqlite3.Connection):
+    def cursor(self, factory=SQLiteCursor):
+        return super().cursor(factory)
+
+    def begin(self):
+        # pymysql-style; sqlite3 would also begin implicitly before the first write
+        self.execute("BEGIN")
+
+    def commit(self):
+        try:
+            super().commit()
+        except sqlite3.OperationalError as e:
+            _raise_busy(e)
+
+    def ping(self, reconnect=True):
+        # A local file cannot drop the connection; this only checks it still works
+        self.execute("SELECT 1")
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _parse_timestamp(value):
+    return datetime.datetime.fromisoformat(value.decode())
+
+
+# TIMESTAMP columns come back as datetime, as they do from pymysql
+sqlite3.register_converter("TIMESTAMP", _parse_timestamp)
+
+
+class SQLiteBackend:
+    name = "sqlite"
+    auto_id = "INTEGER PRIMARY KEY AUTOINCREMENT"
+    table_options = ""
+    error = sqlite3.Error
+    integrity_error = sqlite3.IntegrityError
+
+    def __init__(self, path, timeout=10, cached_statements=128):
+        self.path = path
+        self.timeout = timeout
+        self.cached_statements = cached_statements      # compiled statements kept per connection
+
+    def is_transient(self, error):
+        # "database is locked" past busy_timeout, nothing else
+        return isinstance(error, SQLiteBusyError)
+
+    @classmethod
+    def from_settings(cls, get):
+        return cls(get("SQLITE_PATH", "campus_care.sqlite3"), timeout=float(get("SQLITE_TIMEOUT", 10)))
+
+    def connect(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # The pool moves connections between threads, one user at a time
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            factory=SQLiteConnection,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = _dict_row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")     # durable at checkpoints; safe with WAL
+        return conn
+
+    @contextmanager
+    def migration_lock(self, conn):
+        # SQLite DDL is transactional: BEGIN IMMEDIATE takes the write lock up
+        # front (waiting up to the busy timeout) and holds it until the
+        # caller commits or rolls back
+        with conn.cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE")
+        yield
+
+    def existing_indexes(self, cursor):
+        cursor.execute("SELECT tbl_name AS table_name, name AS index_name FROM sqlite_master WHERE type = 'index'")
+        return {(row["table_name"], row["index_name"]) for row in cursor.fetchall()}
+
+    def create_index(self, cursor, table, name, columns, unique=False):
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        cursor.execute(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+    def upsert(self, key, assignments):
+        return f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET " + ", ".join(
+            f"{column} = {expression or f'excluded.{column}'}" for column, expression in assignments.items()
+        )
+
+    def plan_issues(self, cursor, sql, params):
+        # "SCAN table" without an index is a full table scan; SEARCH and
+        # index scans are fine
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return [
+            row["detail"]
+            for row in cursor.fetchall()
+            if row["detail"].startswith("SCAN ") and "INDEX" not in row["detail"]
+        ]
+
+
+BACKENDS = {
+    MySQLBackend.name: MySQLBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+
+def backend_from_settings(get):
+    # get(key, default=None) reads one setting, e.g. st.secrets.get
+    name = get("STORAGE_BACKEND", "mysql")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown STORAGE_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name].from_settings(get)
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+import migrations
+import queries
+import storage
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return storage.SQLiteBackend(str(tmp_path / "campus_care.sqlite3"))
+
+
+def test_dashboard_queries_use_indexes(backend):
+    conn = backend.connect()
+    try:
+        migrations.migrate(conn, backend)
+        assert migrations.missing_indexes(conn, backend) == []
+        assert migrations.check_query_plans(conn, backend, user_id=1) == {
+            name: [] for name in queries.DASHBOARD_QUERIES
+        }
+    finally:
+        conn.close()
+
+
+def test_migrate_is_idempotent(backend):
+    conn = backend.connect()
+    try:
+        assert migrations.migrate(conn, backend) == [m.version for m in migrations.MIGRATIONS]
+        assert migrations.migrate(conn, backend) == []
+        assert migrations.current_version(conn, backend) == migrations.MIGRATIONS[-1].version
+    finally:
+        conn.close()
+
+
+def test_concurrent_migrations_apply_each_version_once(backend):
+    # App processes starting together with AUTO_MIGRATE
+    results, errors = [], []
+    barrier = threading.Barrier(4)
+
+    def run():
+        conn = backend.connect()
+        try:
+            barrier.wait()
+            results.append(migrations.migrate(conn, backend))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(v for applied in results for v in applied) == [m.version for m in migrations.MIGRATIONS]
+    conn = backend.connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT version FROM schema_migrations ORDER BY version")
+            assert [row["version"] for row in cursor.fetchall()] == [m.version for m in migrations.MIGRATIONS]
+    finally:
+        conn.close()
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from services.db import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.closed = False
+
+    def ping(self, reconnect=True):
+        if not self.healthy:
+            raise ConnectionError("server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeServer:
+    def __init__(self):
+        self.connections = []
+
+    def connect(self):
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+def test_acquire_times_out_when_the_pool_is_exhausted(server):
+    pool = ConnectionPool(server.connect, min_size=0, max_size=1, acquire_timeout=0.05)
+    held = pool.connection()
+    started = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.connection()
+    assert time.monotonic() - started >= 0.05
+    held.close()
+    pool.connection().close()
+
+
+def test_size_cap_under_contention(server):
+    pool = ConnectionPool(server.connect, min_size=0, max_size=3, acquire_timeout=5)
+    lock = threading.Lock()
+    in_use = peak = 0
+
+    def borrow():
+        nonlocal in_use, peak
+        for _ in range(20):
+            with pool.connection():
+                with lock:
+                    in_use += 1
+                    peak = max(peak, in_use)
+                time.sleep(0.001)
+                with lock:
+                    in_use -= 1
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak <= 3
+    assert len(server.connections) <= 3
+
+
+def test_connection_failing_its_ping_is_discarded(server):
+    pool = ConnectionPool(server.connect, min_size=1, max_size=2, health_check_after=0)
+    stale = server.connections[0]
+    stale.healthy = False
+    with pool.connection() as conn:
+        assert conn._conn is not stale
+    assert stale.closed
+
+
+def test_closed_connection_is_reused(server):
+    pool = ConnectionPool(server.connect, min_size=0, max_size=2)
+    first = pool.connection()
+    raw = first._conn
+    first.close()
+    second = pool.connection()
+    assert second._conn is raw
+    assert len(server.connections) == 1
+    second.close()
+
+
+def test_release_rolls_back_only_open_transactions(server):
+    pool = ConnectionPool(server.connect, min_size=0, max_size=1)
+    with pool.connection():
+        pass
+    raw = server.connections[0]
+    assert raw.rollbacks == 0
+    with pool.connection():
+        raw.in_transaction = True
+    assert raw.rollbacks == 1
@@ -0,0 +1,38 @@
+import pytest
+
+import migrations
+import storage
+from services.querylog import LoggedCursor, QueryLog
+
+
+@pytest.fixture
+def conn(tmp_path):
+    backend = storage.SQLiteBackend(str(tmp_path / "campus_care.sqlite3"))
+    conn = backend.connect()
+    migrations.migrate(conn, backend)
+    with conn.cursor() as cursor:
+        cursor.executemany("INSERT INTO users (username, password) VALUES (%s, %s)",
+                           [("amy", "x"), ("ben", "x"), ("cal", "x")])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_select_rows_are_counted_on_fetch(conn):
+    log = QueryLog()
+    with LoggedCursor(conn.cursor(), log) as cursor:
+        cursor.execute("SELECT id FROM users")
+        assert len(cursor.fetchall()) == 3
+        cursor.execute("SELECT id FROM users WHERE username = %s", ("amy",))
+        cursor.fetchone()
+        cursor.execute("SELECT id FROM users")
+        assert len(list(cursor)) == 3
+    assert [record.rows for record in log.records] == [3, 1, 3]
+
+
+def test_write_rows_come_from_rowcount(conn):
+    log = QueryLog()
+    with LoggedCursor(conn.cursor(), log) as cursor:
+        cursor.execute("UPDATE users SET password = %s", ("y",))
+    assert log.records[0].rows == 3
+    assert log.summary()[0].rows == 3
@@ -0,0 +1,62 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import scoring
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def responses():
+    df = pd.read_csv(os.path.join(ROOT, "Form_Responses.csv"), encoding="utf-8-sig")
+    X = scoring.encode_form_responses(df)
+    y = np.unique(df["Depressed_Anxious"].to_numpy(), return_inverse=True)[1]
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def shipped_model():
+    return joblib.load(os.path.join(ROOT, scoring.MODEL_PATH))
+
+
+def _stack(**lr_params):
+    from sklearn.ensemble import RandomForestClassifier, StackingClassifier
+    from sklearn.linear_model import LogisticRegression
+    return StackingClassifier(
+        estimators=[
+            ("Logistic Regression", LogisticRegression(max_iter=1000, **lr_params)),
+            ("Random Forest", RandomForestClassifier(n_estimators=20, random_state=42)),
+        ],
+        final_estimator=LogisticRegression(**lr_params),
+    )
+
+
+def test_compiled_model_matches_sklearn_on_the_survey(shipped_model, responses):
+    X, _ = responses
+    compiled = scoring.compile_model(shipped_model)
+    assert isinstance(compiled, scoring.CompiledStackingModel)
+    assert len(scoring.verify_compiled(shipped_model, compiled, X)) == 0
+    assert len(scoring.verify_compiled(shipped_model, compiled, scoring.verification_sample())) == 0
+
+
+@pytest.mark.parametrize("lr_params", [{"multi_class": "ovr"}, {"solver": "liblinear"}])
+def test_one_vs_rest_logistic_regression_is_not_compiled(responses, lr_params):
+    X, y = responses
+    model = _stack(**lr_params).fit(X, y)
+    adapter = scoring.compile_model(model)
+    assert isinstance(adapter, scoring.SklearnModelAdapter)
+    assert (adapter.predict(X.to_numpy()) == model.predict(X)).all()
+
+
+def test_registry_falls_back_to_sklearn_on_a_mismatch(tmp_path, responses, monkeypatch):
+    X, y = responses
+    path = str(tmp_path / "model.pkl")
+    joblib.dump(_stack().fit(X, y), path)
+    assert isinstance(scoring.ModelRegistry().get_compiled(path), scoring.CompiledStackingModel)
+
+    monkeypatch.setattr(scoring.CompiledStackingModel, "predict_proba", lambda self, X: np.zeros((len(X), 3)))
+    assert isinstance(scoring.ModelRegistry().get_compiled(path), scoring.SklearnModelAdapter)
@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+import migrations
+import storage
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = storage.SQLiteBackend(str(tmp_path / "campus_care.sqlite3"), timeout=0.05)
+    conn = backend.connect()
+    try:
+        migrations.migrate(conn, backend)
+    finally:
+        conn.close()
+    return backend
+
+
+def test_locked_database_is_transient(backend):
+    holder, writer = backend.connect(), backend.connect()
+    try:
+        with holder.cursor() as cursor:
+            cursor.execute("BEGIN IMMEDIATE")
+        with writer.cursor() as cursor, pytest.raises(sqlite3.OperationalError) as raised:
+            cursor.execute("INSERT INTO self_check_logs (user_id, score, risk_level) VALUES (%s, %s, %s)",
+                           (1, 20, "Low"))
+        assert backend.is_transient(raised.value)
+    finally:
+        holder.close()
+        writer.close()
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM no_such_table",
+    "SELECT no_such_column FROM users",
+    "SELEC 1",
+])
+def test_permanent_errors_are_not_transient(backend, sql):
+    conn = backend.connect()
+    try:
+        with conn.cursor() as cursor, pytest.raises(sqlite3.OperationalError) as raised:
+            cursor.execute(sql)
+        assert not backend.is_transient(raised.value)
+    finally:
+        conn.close()
+
+
+def _pymysql_error(errno):
+    import pymysql.err
+    return pymysql.err.error_map.get(errno, pymysql.err.InternalError)(errno, "message")
+
+
+@pytest.mark.parametrize("errno, transient", [
+    (1205, True),       # lock wait timeout
+    (1213, True),       # deadlock
+    (2003, True),       # can't connect
+    (2006, True),       # server has gone away
+    (2013, True),       # lost connection during query
+    (1054, False),      # unknown column
+    (1142, False),      # command denied
+    (3819, False),      # CHECK constraint violated
+])
+def test_mysql_errors_are_classified_by_errno(errno, transient):
+    backend = storage.MySQLBackend("localhost")
+    assert backend.is_transient(_pymysql_error(errno)) is transient
+
+
+@pytest.mark.parametrize("errno, transient", [
+    (1213, True),
+    (2013, True),
+    (2055, True),       # lost connection with a system error
+    (1054, False),
+    (3819, False),
+])
+def test_mysql_connector_errors_are_classified_by_errno(errno, transient):
+    connector = pytest.importorskip("mysql.connector")
+    backend = storage.MySQLBackend("localhost", prepared_statements=True)
+    error = connector.errors.get_mysql_exception(errno, "message")
+    assert backend.is_transient(error) is transient
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+import migrations
+import storage
+from services.db import ConnectionPool, WriteBehindQueue
+
+HIGH_RISK_ROW = (1, 20, 10, 3, 3, 6.5, 2, 2, 3, 1, 0, 1, 0)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = storage.SQLiteBackend(str(tmp_path / "campus_care.sqlite3"))
+    conn = backend.connect()
+    try:
+        migrations.migrate(conn, backend)
+    finally:
+        conn.close()
+    return backend
+
+
+@pytest.fixture
+def pool(backend):
+    pool = ConnectionPool(backend.connect, min_size=0, max_size=3)
+    yield pool
+    pool.close()
+
+
+def _count(pool, table, user_id=None):
+    with pool.connection() as conn, conn.cursor() as cursor:
+        if user_id is None:
+            cursor.execute(f"SELECT COUNT(*) AS n FROM {table}")
+        else:
+            cursor.execute(f"SELECT COUNT(*) AS n FROM {table} WHERE user_id = %s", (user_id,))
+        return cursor.fetchone()["n"]
+
+
+def test_flush_user_ends_the_batch_window(backend, pool):
+    writer = WriteBehindQueue(pool, backend, flush_interval=30)
+    try:
+        writer.submit("self_check_logs", (1, 20, "Low"))
+        started = time.monotonic()
+        assert writer.flush_user(1)
+        assert time.monotonic() - started < 5
+        assert _count(pool, "self_check_logs", 1) == 1
+    finally:
+        writer.close()
+
+
+def test_flush_user_does_not_wait_for_other_users(backend, pool):
+    writer = WriteBehindQueue(pool, backend, flush_interval=30)
+    try:
+        writer.submit("self_check_logs", (2, 20, "Low"))
+        started = time.monotonic()
+        assert writer.flush_user(1, timeout=5)
+        assert time.monotonic() - started < 0.5
+    finally:
+        writer.close()
+
+
+def test_bad_row_is_dropped_and_the_rest_of_the_batch_commits(backend, pool):
+    writer = WriteBehindQueue(pool, backend, flush_interval=30)
+    try:
+        writer.submit("self_check_logs", (1, 20, "Low"))
+        writer.submit("high_risk_responses", HIGH_RISK_ROW[:-2] + (None, 0))     # prediction_result is NOT NULL
+        writer.submit("user_reflections", (1, "module_1", "text"))
+        assert writer.flush_user(1)
+    finally:
+        writer.close()
+    assert _count(pool, "self_check_logs") == 1
+    assert _count(pool, "user_reflections") == 1
+    assert _count(pool, "latest_user_reflections") == 1
+    assert _count(pool, "high_risk_responses") == 0
+
+
+def test_close_writes_queued_rows(backend, pool):
+    writer = WriteBehindQueue(pool, backend, flush_interval=30)
+    for user_id in range(1, 11):
+        writer.submit("self_check_logs", (user_id, 20, "Low"))
+    writer.close()
+    assert _count(pool, "self_check_logs") == 10
+    writer.submit("self_check_logs", (11, 20, "Low"))      # after close, written inline
+    assert _count(pool, "self_check_logs") == 11
+
+
+def test_on_commit_fires_for_each_user(backend, pool):
+    committed = []
+    writer = WriteBehindQueue(pool, backend, flush_interval=30, on_commit=committed.append)
+    try:
+        writer.submit("self_check_logs", (1, 20, "Low"))
+        writer.submit("user_reflections", (2, "module_1", "text"))
+        writer.submit("high_risk_responses", (3,) + HIGH_RISK_ROW[1:])
+        writer.submit("self_check_logs", (1, 25, "High"))
+        writer.flush()
+    finally:
+        writer.close()
+    assert sorted(committed) == [1, 2, 3]
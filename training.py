@@ -0,0 +1,421 @@
+"""Retrain the stacking model and cluster profiles from the survey export.
+
+Scripted version of Code_for_Models_Training.ipynb:
+
+    python training.py Form_Responses.csv
+    python training.py Form_Responses.csv --n-jobs 8 --promote
+    python training.py new_export.csv --smote --output-dir /tmp/models
+
+1. Encode the export as the notebook does (scoring.encode_form_responses,
+   Depressed_Anxious -> 0/1/2) and hold out 30% for testing.
+2. Cross-validate every candidate model on the training split. Each
+   (model, fold) pair is one joblib task, so --n-jobs spreads the work over
+   models and folds together.
+3. Stack the two best models by macro F1 under a logistic regression and
+   score the stack on the holdout.
+4. Cluster the Moderate and Severe groups (PCA + KMeans). Clusters are
+   matched to the current profile CSV by nearest centroid, so they keep their
+   ids, names and descriptions across retrains.
+
+Intermediate results (encoded features, folds, SMOTE-resampled sets, CV
+scores) are cached under --cache-dir, keyed by the SHA-256 of the input file.
+A rerun on unchanged data only refits the stack; new responses change the
+hash and recompute everything.
+
+Each run writes <output-dir>/<version>/ holding the model pickle, the
+cluster profile CSV and a manifest.json. The manifest records the data hash,
+settings, CV scores, holdout metrics and library versions. --promote copies
+the bundle over MODEL_PATH and CLUSTER_PROFILES_PATH, and the running app
+reloads them on the next rerun.
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+
+import numpy as np
+
+import scoring
+
+TARGET = "Depressed_Anxious"
+
+
+# Notebook class names, in LabelEncoder (sorted) order; indices match scoring.GROUP_LABELS
+TARGET_CLASSES = ["Minimal and Mild", "Moderate", "Severe"]
+
+
+# Groups that get cluster profiles, by class index
+CLUSTERED_GROUPS = {1: "Moderate", 2: "Severe"}
+
+
+# Bumped when encoding or splitting changes, so stale cache entries are not reused
+CACHE_VERSION = 1
+
+
+METRICS = ("accuracy", "precision", "recall", "f1")
+
+
+def candidate_models(seed=42):
+    # The notebook's candidates and settings. XGBoost and LightGBM are only
+    # compared when installed (they are not app dependencies). Each model
+    # stays single-threaded; the parallelism is across (model, fold) tasks.
+    from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.svm import SVC
+
+    models = {"Random Forest": RandomForestClassifier(random_state=seed)}
+    try:
+        from xgboost import XGBClassifier
+    except ImportError:
+        pass
+    else:
+        models["XGBoost"] = XGBClassifier(eval_metric="mlogloss", random_state=seed, n_jobs=1)
+    models["Extra Trees"] = ExtraTreesClassifier(random_state=seed)
+    models["Gradient Boosting"] = GradientBoostingClassifier(random_state=seed)
+    try:
+        from lightgbm import LGBMClassifier
+    except ImportError:
+        pass
+    else:
+        models["LightGBM"] = LGBMClassifier(random_state=seed, n_jobs=1, verbose=-1)
+    models["Logistic Regression"] = LogisticRegression(max_iter=1000)
+    models["SVM"] = SVC(probability=True, random_state=seed)
+    return models
+
+
+def _smote(seed):
+    try:
+        from imblearn.over_sampling import SMOTE
+    except ImportError:
+        raise RuntimeError("--smote needs imbalanced-learn (pip install imbalanced-learn)") from None
+    return SMOTE(random_state=seed)
+
+
+def _params_digest(*parts):
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class ArtifactCache:
+    # Pickled intermediate results under <root>/<data digest>/<name>.pkl.
+    # With root=None nothing is cached.
+    def __init__(self, root, digest):
+        self.directory = os.path.join(root, digest) if root else None
+        self.hits = []
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.pkl")
+
+    def load(self, name):
+        # The cached value, or None when missing (or caching is off)
+        import joblib
+        if self.directory is None or not os.path.exists(self._path(name)):
+            return None
+        self.hits.append(name)
+        return joblib.load(self._path(name))
+
+    def save(self, name, value):
+        import joblib
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self._path(name)}.{os.getpid()}.tmp"
+        joblib.dump(value, tmp)
+        os.replace(tmp, self._path(name))     # concurrent runs never read a half-written entry
+
+    def get_or_compute(self, name, compute):
+        value = self.load(name)
+        if value is None:
+            value = compute()
+            self.save(name, value)
+        return value
+
+
+def load_dataset(path):
+    # (raw frame, encoded features, encoded target) as the notebook builds them
+    import pandas as pd
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    X = scoring.encode_form_responses(df)
+    classes, y = np.unique(df[TARGET].to_numpy(), return_inverse=True)
+    if list(classes) != TARGET_CLASSES:
+        raise ValueError(f"{TARGET} has classes {list(classes)}, expected {TARGET_CLASSES}")
+    if X.isna().any().any():
+        raise ValueError("Age has values that are not numbers")
+    return df, X, y.astype(np.int64)
+
+
+def split(X, y, test_size, seed):
+    from sklearn.model_selection import train_test_split
+    return train_test_split(X, y, test_size=test_size, random_state=seed)
+
+
+def make_folds(X, y, n_folds, seed, smote):
+    # [(X_train, y_train, X_test, y_test)] per stratified fold. SMOTE only
+    # resamples the training side, so no synthetic rows reach a test fold.
+    from sklearn.model_selection import StratifiedKFold
+    sampler = _smote(seed) if smote else None
+    folds = []
+    for train_idx, test_idx in StratifiedKFold(n_splits=n_folds).split(X, y):
+        X_train, y_train = X.iloc[train_idx], y[train_idx]
+        if sampler is not None:
+            X_train, y_train = sampler.fit_resample(X_train, y_train)
+        folds.append((X_train, y_train, X.iloc[test_idx], y[test_idx]))
+    return folds
+
+
+def _scores(y_true, y_pred):
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+    return {
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision": precision_score(y_true, y_pred, average="macro", zero_division=0),
+        "recall": recall_score(y_true, y_pred, average="macro", zero_division=0),
+        "f1": f1_score(y_true, y_pred, average="macro", zero_division=0),
+    }
+
+
+def _fit_and_score(model, X_train, y_train, X_test, y_test):
+    model.fit(X_train, y_train)
+    return _scores(y_test, model.predict(X_test))
+
+
+def cross_validate_models(models, folds, cache, folds_key, n_jobs=-1):
+    # {name: {"mean_<metric>": ..., "std_<metric>": ...}}; only models whose
+    # params or folds changed since the last cached run are refitted
+    from joblib import Parallel, delayed
+    from sklearn.base import clone
+
+    keys = {name: f"cv-{_params_digest(name, model.get_params(), folds_key)}" for name, model in models.items()}
+    results, pending = {}, []
+    for name in models:
+        cached = cache.load(keys[name])
+        if cached is None:
+            pending.append(name)
+        else:
+            results[name] = cached
+
+    tasks = [(name, fold) for name in pending for fold in folds]
+    scores = Parallel(n_jobs=n_jobs)(delayed(_fit_and_score)(clone(models[name]), *fold) for name, fold in tasks)
+    for name in pending:
+        per_fold = [s for (task_name, _), s in zip(tasks, scores) if task_name == name]
+        summary = {}
+        for metric in METRICS:
+            values = np.array([s[metric] for s in per_fold])
+            summary[f"mean_{metric}"] = float(values.mean())
+            summary[f"std_{metric}"] = float(values.std())
+        results[name] = summary
+        cache.save(keys[name], summary)
+    return {name: results[name] for name in models}
+
+
+def build_stack(models, ranking, n_jobs=-1):
+    from sklearn.base import clone
+    from sklearn.ensemble import StackingClassifier
+    from sklearn.linear_model import LogisticRegression
+    return StackingClassifier(
+        estimators=[(name, clone(models[name])) for name in ranking[:2]],
+        final_estimator=LogisticRegression(),
+        n_jobs=n_jobs,
+    )
+
+
+def _match_clusters(previous, group, centroids):
+    # new cluster label -> previous cluster id, by the pairing with the least
+    # total squared distance between centroids. Identity when there is no
+    # comparable previous group.
+    labels = sorted(centroids)
+    try:
+        ids, matrix = previous.centroids(group)
+    except (AttributeError, KeyError):
+        return {label: label for label in labels}
+    if len(ids) != len(labels):
+        return {label: label for label in labels}
+
+    def cost(order):
+        return sum(float(np.sum((centroids[label] - matrix[i]) ** 2)) for label, i in zip(labels, order))
+
+    best = min(itertools.permutations(range(len(ids))), key=cost)
+    return {label: int(ids[i]) for label, i in zip(labels, best)}
+
+
+def fit_cluster_profiles(X, y, previous=None, seed=42):
+    # The notebook's clustering: standardise over all students, then per group
+    # PCA to 2 components, KMeans with 2 clusters, and min-max scaled feature
+    # means as the profile. Returns (CSV rows, {group: silhouette score}).
+    from sklearn.cluster import KMeans
+    from sklearn.decomposition import PCA
+    from sklearn.metrics import silhouette_score
+    from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+    scaled = StandardScaler().fit_transform(X[scoring.CLUSTER_FEATURES].to_numpy(np.float64))
+    rows, quality = [], {}
+    for code, group in CLUSTERED_GROUPS.items():
+        members = scaled[y == code]
+        reduced = PCA(n_components=2, random_state=seed).fit_transform(members)
+        labels = KMeans(n_clusters=2, random_state=seed).fit_predict(reduced)
+        quality[group] = float(silhouette_score(reduced, labels))
+        normalised = MinMaxScaler().fit_transform(members)
+        centroids = {int(label): normalised[labels == label].mean(axis=0) for label in np.unique(labels)}
+
+        ids = _match_clusters(previous, group, centroids)
+        for label in sorted(centroids, key=ids.get):
+            cluster = ids[label]
+            profile = previous.get(group, cluster) if previous is not None else None
+            row = {"Cluster": cluster}
+            row.update(zip(scoring.CLUSTER_FEATURES, (float(v) for v in centroids[label])))
+            row["Group"] = group
+            row["Cluster_Description"] = profile.description if profile else ""
+            row["Cluster_Name"] = profile.name if profile else ""
+            rows.append(row)
+    return rows, quality
+
+
+def write_profiles(rows, path):
+    fields = ["Cluster", *scoring.CLUSTER_FEATURES, "Group", "Cluster_Description", "Cluster_Name"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _install(source, target):
+    tmp = f"{target}.tmp"
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, target)     # the app's registries never see a partial file
+
+
+def train(input_path, output_dir="models", cache_dir=".training_cache", n_jobs=-1, n_folds=10,
+          test_size=0.3, seed=42, smote=False, previous_profiles=scoring.CLUSTER_PROFILES_PATH, log=print):
+    import joblib
+    import sklearn
+
+    started = time.perf_counter()
+    digest = scoring._file_digest(input_path)
+    cache = ArtifactCache(cache_dir, digest)
+    log(f"Input {input_path} (sha256 {digest[:12]})")
+
+    df, X, y = cache.get_or_compute(f"encoded-v{CACHE_VERSION}", lambda: load_dataset(input_path))
+    split_key = f"split-v{CACHE_VERSION}-{test_size}-{seed}"
+    X_train, X_test, y_train, y_test = cache.get_or_compute(split_key, lambda: split(X, y, test_size, seed))
+    folds_key = f"{split_key}-folds{n_folds}-smote{int(smote)}"
+    folds = cache.get_or_compute(folds_key, lambda: make_folds(X_train, y_train, n_folds, seed, smote))
+    if smote:
+        X_fit, y_fit = cache.get_or_compute(
+            f"{split_key}-resampled", lambda: _smote(seed).fit_resample(X_train, y_train))
+    else:
+        X_fit, y_fit = X_train, y_train
+
+    models = candidate_models(seed)
+    log(f"Cross-validating {len(models)} models x {n_folds} folds (n_jobs={n_jobs})")
+    cv = cross_validate_models(models, folds, cache, folds_key, n_jobs)
+    ranking = sorted(cv, key=lambda name: cv[name]["mean_f1"], reverse=True)
+    for name in ranking:
+        log(f"  {name:20} f1 {cv[name]['mean_f1']:.3f} +/- {cv[name]['std_f1']:.3f}"
+            f"  accuracy {cv[name]['mean_accuracy']:.3f}")
+
+    stack = build_stack(models, ranking, n_jobs).fit(X_fit, y_fit)
+    holdout = {k: float(v) for k, v in _scores(y_test, stack.predict(X_test)).items()}
+    log(f"Stacked {' + '.join(ranking[:2])}: holdout f1 {holdout['f1']:.3f}, accuracy {holdout['accuracy']:.3f}")
+
+    compiled = scoring.compile_model(stack)
+    is_compiled = isinstance(compiled, scoring.CompiledStackingModel)
+    mismatches = len(scoring.verify_compiled(stack, compiled, X)) if is_compiled else None
+
+    previous = None
+    if previous_profiles and os.path.exists(previous_profiles):
+        previous = scoring.ClusterProfileStore(previous_profiles).get()
+    profile_rows, silhouettes = fit_cluster_profiles(X, y, previous, seed)
+
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{digest[:8]}"
+    bundle = os.path.join(output_dir, version)
+    os.makedirs(bundle)
+    model_path = os.path.join(bundle, os.path.basename(scoring.MODEL_PATH))
+    profiles_path = os.path.join(bundle, os.path.basename(scoring.CLUSTER_PROFILES_PATH))
+    joblib.dump(stack, model_path)
+    write_profiles(profile_rows, profiles_path)
+
+    manifest = {
+        "version": version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "input": {"path": os.path.abspath(input_path), "sha256": digest, "rows": len(df)},
+        "settings": {"n_folds": n_folds, "test_size": test_size, "seed": seed, "smote": smote},
+        "features": scoring.MODEL_FEATURES,
+        "classes": TARGET_CLASSES,
+        "cross_validation": {name: cv[name] for name in ranking},
+        "stack": {"estimators": ranking[:2], "final_estimator": "Logistic Regression"},
+        "holdout": holdout,
+        "compiled": {"compiles": is_compiled, "mismatches": mismatches},
+        "clusters": {
+            "silhouette": silhouettes,
+            "unnamed": [f"{r['Group']} {r['Cluster']}" for r in profile_rows if not r["Cluster_Name"]],
+        },
+        "files": {
+            os.path.basename(path): scoring._file_digest(path) for path in (model_path, profiles_path)
+        },
+        "versions": {
+            "python": platform.python_version(),
+            "scikit-learn": sklearn.__version__,
+            "numpy": np.__version__,
+            "joblib": joblib.__version__,
+        },
+        "cache_hits": cache.hits,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+    with open(os.path.join(bundle, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    log(f"Wrote {bundle} in {manifest['seconds']}s")
+    return bundle, manifest
+
+
+def promote(bundle, model_path=scoring.MODEL_PATH, profiles_path=scoring.CLUSTER_PROFILES_PATH):
+    _install(os.path.join(bundle, os.path.basename(scoring.MODEL_PATH)), model_path)
+    _install(os.path.join(bundle, os.path.basename(scoring.CLUSTER_PROFILES_PATH)), profiles_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the stacking model and cluster profiles.")
+    parser.add_argument("input", help="survey export with the model features and Depressed_Anxious")
+    parser.add_argument("--output-dir", default="models", help="where versioned bundles are written")
+    parser.add_argument("--cache-dir", default=".training_cache", help="intermediate artifacts, keyed by input hash")
+    parser.add_argument("--no-cache", action="store_true", help="recompute everything and cache nothing")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="parallel (model, fold) fits; -1 uses every core")
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--test-size", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--smote", action="store_true", help="oversample minority classes in training (needs imbalanced-learn)")
+    parser.add_argument("--profiles", default=scoring.CLUSTER_PROFILES_PATH,
+                        help="current cluster profiles, to carry cluster ids and names over")
+    parser.add_argument("--promote", action="store_true",
+                        help=f"install the bundle as {scoring.MODEL_PATH} and {scoring.CLUSTER_PROFILES_PATH}")
+    parser.add_argument("--min-f1", type=float, default=0.0,
+                        help="fail (and do not promote) if the holdout macro F1 is below this")
+    args = parser.parse_args(argv)
+
+    try:
+        bundle, manifest = train(
+            args.input, output_dir=args.output_dir, cache_dir=None if args.no_cache else args.cache_dir,
+            n_jobs=args.n_jobs, n_folds=args.folds, test_size=args.test_size, seed=args.seed,
+            smote=args.smote, previous_profiles=args.profiles,
+        )
+    except (RuntimeError, ValueError) as e:
+        print(f"Training failed: {e}", file=sys.stderr)
+        return 1
+
+    if manifest["compiled"]["mismatches"]:
+        print(f"Compiled model disagrees with sklearn on {manifest['compiled']['mismatches']} rows", file=sys.stderr)
+        return 1
+    if manifest["holdout"]["f1"] < args.min_f1:
+        print(f"Holdout F1 {manifest['holdout']['f1']:.3f} is below --min-f1 {args.min_f1}", file=sys.stderr)
+        return 1
+    if args.promote:
+        promote(bundle)
+        print(f"Promoted {manifest['version']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Stylesheets and HTML fragments kept under static/.
+
+Stylesheets are linked rather than inlined, so a rerun only carries a short
+<link> tag and the browser downloads each file once. They are served through
+a declared component's file route: /app/static sends .css as text/plain with
+nosniff, which browsers refuse to apply. Set INLINE_ASSETS in the secrets to
+inline them instead (e.g. behind a proxy that only forwards the websocket).
+"""
+import functools
+import hashlib
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+
+
+@functools.lru_cache(maxsize=None)
+def read_asset(name):
+    with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@st.cache_resource
+def _assets_component():
+    # Only registers static/ with the component file server; it is never rendered
+    return components.declare_component("assets", path=STATIC_DIR)
+
+
+@functools.lru_cache(maxsize=None)
+def _asset_url(component_name, name):
+    # The content hash changes the URL, and so busts the browser cache, on edits
+    digest = hashlib.sha1(read_asset(name).encode("utf-8")).hexdigest()[:10]
+    return f"component/{component_name}/{name}?v={digest}"
+
+
+def asset_url(name):
+    return _asset_url(_assets_component().name, name)
+
+
+def inline_assets():
+    return bool(st.secrets.get("INLINE_ASSETS", False))
+
+
+def stylesheet_tag(name):
+    if inline_assets():
+        return f"<style>\n{read_asset(name)}</style>"
+    return f'<link rel="stylesheet" href="{asset_url(name)}">'
+
+
+def use_stylesheet(name):
+    st.markdown(stylesheet_tag(name), unsafe_allow_html=True)
@@ -0,0 +1,45 @@
+"""Authentication page (DB-based)."""
+import streamlit as st
+
+from services.auth import PasswordServiceBusy, create_user, validate_user
+
+
+def render():
+    st.markdown("### 👤 Welcome to Campus Care")
+    st.markdown("Remember to sign up before you log in if you are new!")
+    st.markdown("")
+    st.markdown("Rest assured, your credentials and data are encrypted and will not be disclosed to anyone outside of Campus Care.")
+    st.markdown("")
+    auth_mode = st.radio("Choose an option", ["Log In", "Sign Up"], horizontal=True)
+
+    username = st.text_input("Username")
+    password = st.text_input("Password", type="password")
+
+    if auth_mode == "Sign Up":
+        if st.button("Sign Up"):
+            try:
+                created = create_user(username, password)
+            except PasswordServiceBusy:
+                st.warning("Lots of students are signing in right now. Please try again in a few seconds.")
+            else:
+                if created:
+                    st.success("Account created. Please log in.")
+                else:
+                    st.error("Username already exists.")
+    else:
+        if st.button("Log In"):
+            try:
+                principal = validate_user(username, password)
+            except PasswordServiceBusy:
+                st.warning("Lots of students are signing in right now. Please try again in a few seconds.")
+            else:
+                if principal:
+                    st.session_state.authenticated = True
+                    st.success("Login successful!")
+                    st.session_state.username = username  
+                    st.session_state.principal = principal
+                    st.session_state.page = "self_check"  
+                    st.rerun()
+                else:
+                    st.error("Invalid credentials.")
+    st.markdown("</div>", unsafe_allow_html=True)
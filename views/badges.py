@@ -0,0 +1,53 @@
+"""Dashboard badges: one stylesheet and one HTML template per badge type."""
+import functools
+from collections import namedtuple
+
+import streamlit as st
+
+from views.assets import inline_assets, read_asset, stylesheet_tag
+
+Badge = namedtuple("Badge", ["stylesheet", "template"])
+
+BADGES = {
+    name: Badge(stylesheet=f"badges/{name}.css", template=f"badges/{name}.html")
+    for name in (
+        "stress_free_champ",
+        "risk_alert_explorer",
+        "balanced_tracker",
+        "calm_responder",
+        "high_risk_watcher",
+        "mixed_journey_explorer",
+    )
+}
+
+
+def select_badge(total, low, high):
+    # Which badge the check-in history earns; total must be positive
+    low_ratio = low / total
+    high_ratio = high / total
+
+    if low == total:
+        return "stress_free_champ"
+    if high == total:
+        return "risk_alert_explorer"
+    if abs(low - high) <= 1 and total >= 2:
+        return "balanced_tracker"
+    if low_ratio >= 0.7:
+        return "calm_responder"
+    if high_ratio >= 0.7:
+        return "high_risk_watcher"
+    return "mixed_journey_explorer"
+
+
+@functools.lru_cache(maxsize=None)
+def _badge_html(name, inline):
+    badge = BADGES[name]
+    return stylesheet_tag(badge.stylesheet) + "\n\n" + read_asset(badge.template)
+
+
+def badge_html(name):
+    return _badge_html(name, inline_assets())
+
+
+def render_badge(name):
+    st.markdown(badge_html(name), unsafe_allow_html=True)
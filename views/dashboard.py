@@ -0,0 +1,118 @@
+"""Per-user wellness dashboard."""
+import streamlit as st
+
+from services.auth import current_user_id
+from services.dashboard import load_dashboard
+from views.badges import render_badge, select_badge
+
+
+def render():
+    st.title("📊 Your Mental Wellness Dashboard")
+
+    user_id = current_user_id()
+
+    snapshot = load_dashboard(user_id)
+
+    # Show Visit Summary
+    total, low, high = snapshot.total, snapshot.low, snapshot.high
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(f"""
+            <div class="metric-card">
+                <h3>Total Check-Ins</h3>
+                <p style='font-size: 24px; font-weight: bold;'>{total}</p>
+            </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+            <div class="metric-card">
+                <h3>🟢 Low-Risk Sessions</h3>
+                <p style='font-size: 24px; font-weight: bold;'>{low}</p>
+            </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown(f"""
+            <div class="metric-card">
+                <h3>🔴 High-Risk Sessions</h3>
+                <p style='font-size: 24px; font-weight: bold;'>{high}</p>
+            </div>
+        """, unsafe_allow_html=True)
+
+    # Two-column layout
+    left_col, right_col = st.columns(2)
+
+    # 🔬 Left: Most Recent Cluster Visits
+    with left_col:
+        st.markdown("### 🔬 Recent High-Risk Clusters")
+        recent_clusters = snapshot.recent_clusters
+        if recent_clusters:
+            for cluster in recent_clusters:
+                st.markdown(f"""
+                    <div class="cluster-card">
+                        <h4>{cluster['label']}</h4>                     
+                        <p><strong>Description:</strong> {cluster['description']}</p>
+                        <p><strong>Date:</strong> {cluster['date']}</p>
+                    </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.info("All check-ins are low risk!")
+
+    # 🏅 Right: Award Badge
+    with right_col:
+        st.markdown("### 🏅 Badge")
+        
+        if total == 0:
+            st.info("Complete a check-in to start earning badges!")
+        else:
+            render_badge(select_badge(total, low, high))
+
+
+    # 📝 Display Reflections
+    with st.container():
+        st.markdown("""
+        <div style='background-color: #EEF1FF; padding: 20px; border-radius: 12px; margin-top: 20px;'>
+            <h3 style='margin-top: 0;'>📝 Reflections from Wellness Modules</h3>
+        """, unsafe_allow_html=True)
+        st.markdown("")
+
+        user_reflections = snapshot.reflections
+            
+        # Module to question mapping
+        module_questions = {
+            "Module 1": "What's something you've learned or resonated with anxiety in university life?",
+            "Module 2": "What is something you’re grateful today?",
+            "Module 3": "What does mental wellness mean to you right now?"
+        }
+        
+        if user_reflections:
+            for ur in user_reflections:
+                question = module_questions.get(ur["module_name"], "Reflection Question")
+                st.markdown(f"""
+                    <div style='margin-bottom: 15px; padding: 25px 15px 10px 25px; background-color: #FFF9F9; border-radius: 8px; border: 1px solid #ddd;'>
+                        <p style='margin-bottom: 5px;'><strong>📌 {question}</strong></p>
+                        <p style='margin: 0 0 15px 0; padding-left: 10px; border-left: 3px solid #8069a1; color: #333;'>{ur["reflection"]}</p>
+                        <p style='font-size: 0.8em; color: gray; margin-top: 5px;'>📅 Submitted on: {ur["created_at"].strftime("%Y-%m-%d")}</p>
+                    </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown("<em>You haven’t submitted any reflections yet.</em>", unsafe_allow_html=True)
+    
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown(
+        """    
+        <div class="footer">
+            Badge styles credited to <a href="https://uiverse.io/" target="_blank">Uiverse.io</a>, 
+            <a href="https://freefrontend.com/css-badges/" target="_blank">FreeFrontend</a>, and 
+            <a href="https://codepen.io/" target="_blank">CodePen</a> creators: 
+            <a href="https://codepen.io/jonnitto/pen/xQYEGV" target="_blank">jonnitto</a>, 
+            <a href="https://codepen.io/zachacole/pen/xbzaJP" target="_blank">zachacole1</a>, 
+            <a href="https://codepen.io/zachacole/pen/zxRxWM" target="_blank">zachacole2</a>,  
+            <a href="https://codepen.io/gatauade/pen/zpVLzd" target="_blank">gatauade</a>.
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
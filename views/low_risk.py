@@ -0,0 +1,270 @@
+"""Low-risk pathway and the wellness micro-modules."""
+import streamlit as st
+
+from services.auth import current_user_id
+from services.records import save_reflection
+
+
+def render_pathway():
+    st.title("🟢 Low-Risk Pathway")
+    st.markdown("""
+    Your mental well-being appears to be in a positive range!
+
+    These short awareness modules are designed to:
+    - Increase self-understanding
+    - Raise awareness about emotional well-being
+    - Introduce daily micro-habits for mental resilience
+
+    Let’s go through them together — one step at a time.
+    """)
+
+    if st.button("🎓 Begin Wellness Modules"):
+        st.session_state.page = "low_risk_modules"
+        st.rerun()
+
+
+def render_modules():
+    st.title("Wellness Micro-Modules")
+
+    # Track module completion in session state
+    if "completed_modules" not in st.session_state:
+        st.session_state.completed_modules = {"mod1": False, "mod2": False, "mod3": False}
+
+    # --- Module 1 ---
+    st.markdown("---")
+    st.markdown("### 🎓 Module 1: Understanding Anxiety in University Life")
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "📘 Overview", 
+        "👩‍🎓 Meet Zara & Ethan", 
+        "💬 Real Symptoms", 
+        "🙈 Why We Hide It", 
+        "🧠 Why This Matters"
+    ])
+    
+    with tab1:
+        st.markdown("""
+        This module is designed to help you understand **what anxiety can look like** in university students.  
+        While some signs are visible, many symptoms are subtle and internal.
+    
+        You may not even realize someone around you — or even you — are dealing with anxiety until it's overwhelming.
+    
+        Let's break it down together.
+        """)
+    
+    with tab2:
+        st.markdown("""
+        #### 👩 Zara  
+        - Always prepared, active in clubs, a top student.  
+        - But secretly, she rereads her emails 10 times before sending them.  
+        - She's constantly anxious about sounding “dumb” or “wrong.”  
+        - Even small mistakes send her into spirals of doubt.
+    
+        #### 👦 Ethan  
+        - The funny one in class, known for keeping spirits up.  
+        - Lately, he’s been missing lectures, skipping meals, and struggling to concentrate.  
+        - He laughs it off — but deep down, he feels overwhelmed and stuck.
+    
+        These stories reflect what many students experience — even when no one else notices.
+        """)
+    
+    with tab3:
+        st.markdown("""
+        Anxiety doesn’t always scream — sometimes, it whispers through habits and feelings like:
+    
+        - 💤 Waking up already feeling drained  
+        - 📉 Constant self-doubt about performance  
+        - 🙅 Skipping hangouts due to mental fatigue  
+        - 😐 Feeling “numb” or disconnected even when surrounded by friends  
+        - 🔁 Replaying small events over and over in your head  
+    
+        These symptoms don’t mean someone is failing — it means they’re human and overwhelmed.
+        """)
+    
+    with tab4:
+        st.markdown("""
+        Many students **hide their anxiety** for reasons like:
+    
+        - “Everyone else seems fine, so I should be too.”  
+        - “I don’t want to be dramatic or get judged.”  
+        - “If I speak up, people will think I’m weak.”  
+        - “It’s not a big deal… right?”
+    
+        But here’s the truth:  
+        ❗ You don’t need a breakdown to justify your feelings.  
+        ❗ You don’t need to suffer silently to be strong.
+    
+        Real strength is acknowledging the struggle — and choosing to take care of yourself anyway.
+        """)
+    
+    with tab5:
+        st.markdown("""
+        Anxiety can sneak into your academic, social, and personal life if left unchecked.
+    
+        - You may lose motivation  
+        - You may isolate yourself  
+        - You may burn out silently
+    
+        But identifying it early and being kind to yourself is the first step toward managing it.
+    
+        > 🧡 Remember: You're allowed to take up space. You're allowed to ask for help.  
+        > Healing starts with honesty — and you’ve already taken the first step.
+    
+        Mental wellness is about more than surviving uni — it's about building a life where you feel safe, capable, and supported.
+        """)
+
+    if not st.session_state.completed_modules["mod1"]:
+        st.markdown("")
+        st.markdown("")
+        st.markdown("💬 **Reflection:** What's something you've learned or resonated with anxiety in university life?")
+        mod1_reflection = st.text_area("Your thoughts on anxiety awareness", key="mod1_input")
+    
+        if st.button("✅ Complete Module 1"):
+            if mod1_reflection.strip():
+                user_id = current_user_id()
+                save_reflection(user_id, "Module 1", mod1_reflection)
+            st.session_state.completed_modules["mod1"] = True
+            st.rerun()
+
+    # --- Module 2 ---
+    st.markdown("---")
+    if st.session_state.completed_modules["mod1"]:
+        with st.container():
+            st.markdown("### 🧘 Module 2: 2-Minute Gratitude Reflection")
+
+            tab1, tab2, tab3 = st.tabs([
+                "🌤️ Why Gratitude?", 
+                "📝 Try This Now", 
+                "🔁 Make It a Habit"
+            ])
+            
+            with tab1:
+                st.markdown("""
+                When everything feels overwhelming, **gratitude can shift your brain’s focus** — even for just a moment.
+            
+                Gratitude isn't about ignoring your problems. It's about noticing what's *still* okay despite them.
+            
+                Researchers found that students who practiced gratitude reported:
+            
+                - Lower stress levels
+                - Better sleep
+                - A more positive outlook during exams
+            
+                It’s a small pause, but it can have a **big impact** on your emotional balance.
+                """)
+            
+            with tab2:
+                st.markdown("""
+                Close your eyes (or just slow your thoughts) and reflect on these prompts:
+            
+                - 🍲 *What is something I ate recently that I enjoyed?*
+                - 💬 *Who is one person — even if just online — who made me smile this week?*
+                - 🌱 *What’s one small win I had today?*
+            
+                Even on hard days, these moments are still real.
+            
+                > “Gratitude turns what we have into enough.”  
+                > – A reminder from Kai 💙
+                """)
+            
+            with tab3:
+                st.markdown("""
+                Just **2 minutes a day** can help:
+            
+                - Ground you when you feel scattered  
+                - Train your mind to notice the good  
+                - Reduce the spiral of stress  
+            
+                🧠 **Tip:** Set a phone reminder titled:  
+                _"What’s one good thing today?"_
+            
+                Don’t overthink it — just answer honestly.
+            
+                Consistency matters more than perfection.
+                """)
+
+            if not st.session_state.completed_modules["mod2"]:
+                st.markdown("")
+                st.markdown("")
+                st.markdown("💬 **Reflection:** What is something you’re grateful for today?")
+                mod2_reflection = st.text_area("Write a gratitude note", key="mod2_input")
+            
+                if st.button("✅ Complete Module 2"):
+                    if mod2_reflection.strip():
+                        user_id = current_user_id()
+                        save_reflection(user_id, "Module 2", mod2_reflection)
+                    st.session_state.completed_modules["mod2"] = True
+                    st.rerun()
+
+    # --- Module 3 ---
+    st.markdown("---")
+    if st.session_state.completed_modules["mod2"]:
+        with st.container():
+            st.markdown("### 💡 Module 3: What Does Mental Wellness Mean to You?")
+
+            tab1, tab2, tab3 = st.tabs([
+                "🔍 Not a One-Size Answer", 
+                "🧩 Reflect On Yourself", 
+                "🎯 Why This Matters"
+            ])
+            
+            with tab1:
+                st.markdown("""
+                Mental wellness looks different for everyone.
+            
+                - For some, it’s *getting out of bed before 10am*  
+                - For others, it’s *feeling safe to cry*  
+                - Or simply *feeling at ease in your own mind*
+            
+                Don’t compare your version of wellness to others.
+            
+                > Your journey isn’t less valid just because it looks different.
+                """)
+            
+            with tab2:
+                st.markdown("""
+                Take a quiet moment to reflect or jot these down:
+            
+                - 😌 *When do I feel most at peace?*
+                - ⚖️ *What throws me off balance emotionally?*
+                - ❤️ *What support would I ask for if I wasn’t afraid?*
+                - 🛠️ *What small habit helps me reset my mind?*
+            
+                Mental wellness isn’t an end goal — it’s an ongoing awareness of what helps you **feel like yourself** again.
+                """)
+            
+            with tab3:
+                st.markdown("""
+                Knowing *your own definition* of mental wellness helps you:
+            
+                - Set realistic goals  
+                - Advocate for what you need  
+                - Spot early warning signs  
+            
+                Most importantly, it reminds you that:
+            
+                🧡 **You’re not broken. You’re human.**  
+                You deserve support that meets *your* needs — not just generic advice.
+            
+                This reflection is about **self-kindness**, not self-judgment.
+                """)
+    
+            if not st.session_state.completed_modules["mod3"]:
+                st.markdown("")
+                st.markdown("")
+                st.markdown("💬 **Reflection:** What does mental wellness mean to *you* right now?")
+                mod3_reflection = st.text_area("Your mental wellness definition", key="mod3_input")
+            
+                if st.button("✅ Complete Module 3"):
+                    if mod3_reflection.strip():
+                        user_id = current_user_id()
+                        save_reflection(user_id, "Module 3", mod3_reflection)
+                    st.session_state.completed_modules["mod3"] = True
+                    st.rerun()    
+
+    # Final action button if all modules completed
+    if all(st.session_state.completed_modules.values()):
+        st.success("🎉 All modules completed! You can now proceed to your dashboard.")
+        if st.button("🚀 Go to Dashboard"):
+            st.session_state.page = "dashboard"
+            st.rerun()
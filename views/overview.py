@@ -0,0 +1,45 @@
+"""Homepage / feature overview."""
+import streamlit as st
+
+
+def render():
+    st.markdown("""
+    <div style='text-align: justify; font-size: 20px;'>
+        🧭 <strong>Campus Care</strong> is a student-centered wellbeing platform designed to support your mental health, emotional balance, and personal growth throughout your university journey. Whether you need a moment to reflect, a safe space to check in, or tools to help manage stress, Campus Care is here to walk with you — every step of the way.
+    </div>
+""", unsafe_allow_html=True)
+    st.markdown("---")
+    st.markdown("##### With Campus Care, you can:\n")
+    st.markdown("")
+
+    features = [
+        {"step": "1", "title": "🚀 Getting Started", "desc": "Begin your wellness journey by exploring tools and resources tailored to your needs."},
+        {"step": "2", "title": "🧠 Self-Assessment", "desc": "Take a quick 7-question quiz to check your current well-being score."},
+        {"step": "3", "title": "🚦 Smart Pathways", "desc": "Based on your results, navigate between High-Risk or Low-Risk pathways."},
+        {"step": "4", "title": "🛡️ Risk Detection", "desc": "Multi-layered analysis helps identify your support needs accurately."},
+        {"step": "5", "title": "💬 Cluster Insights", "desc": "Discover which group you align with based on similar behavior and wellness patterns."},
+        {"step": "6", "title": "🎁 Personalized Dashboard", "desc": "Earn badges, track your progress, and see everything in one view!"}
+    ]
+
+
+    for i in range(0, len(features), 2):
+        col1, col2 = st.columns(2)
+        for j, col in enumerate([col1, col2]):
+            if i + j < len(features):
+                f = features[i + j]
+                col.markdown(f"""
+                <div class="feature-card">
+                    <div class="step-circle">{f['step']}</div>
+                    <h4 style="margin: 0; font-size: 1.2em;">{f['title']}</h4>
+                    <p style="margin: 8px 0 0 0; font-size: 1em; color: #333;">{f['desc']}</p>
+                </div>
+                """, unsafe_allow_html=True)
+    st.markdown("---")
+    st.markdown("Because caring for your mind is just as important as your grades.\n")
+    st.markdown("##### Welcome to a campus that cares — welcome to Campus Care.\n")
+
+    st.markdown("""
+    <div class="footer">
+        Developed by Debbie Foo, University of Wollongong Malaysia.
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,30 @@
+"""Debug sidebar panel listing the SQL the current rerun sent (SQL_DEBUG_PANEL)."""
+import streamlit as st
+
+from services.querylog import current_query_log
+
+
+def _cell(statement, width=90):
+    text = statement if len(statement) <= width else statement[:width - 1] + "…"
+    return "`" + text.replace("|", "\\|").replace("`", "'") + "`"
+
+
+def render_query_panel():
+    log = current_query_log()
+    if log is None:
+        return
+    summary = log.summary()
+    calls = sum(row.calls for row in summary)
+    with st.sidebar.expander(f"🛠 SQL this rerun: {calls} statements, {log.total_seconds * 1000:.0f} ms"):
+        if not summary:
+            st.caption("No statements were sent.")
+            return
+        lines = ["| Statement | Calls | Total ms | Max ms | Rows | |", "|---|---|---|---|---|---|"]
+        for row in summary:
+            flags = " ".join(flag for flag, on in (("🐢 slow", row.slow), ("🔁 N+1", row.repeated)) if on)
+            lines.append(
+                f"| {_cell(row.statement)} | {row.calls} | {row.total_seconds * 1000:.1f} "
+                f"| {row.max_seconds * 1000:.1f} | {row.rows} | {flags} |"
+            )
+        st.markdown("\n".join(lines))
+        st.caption(f"Slow: ≥ {log.slow_seconds * 1000:.0f} ms · N+1: the same statement {log.repeat_threshold}+ times")
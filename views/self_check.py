@@ -0,0 +1,123 @@
+"""Self check: the step 1 questionnaire that routes to a pathway."""
+import streamlit as st
+
+from services.auth import current_user_id
+from services.records import save_self_check_visit
+
+# SWEMWBS totals run from 7 to 35; this score or lower takes the high-risk pathway
+HIGH_RISK_MAX_SCORE = 21
+
+
+def risk_level(total_score):
+    return "High" if total_score <= HIGH_RISK_MAX_SCORE else "Low"
+
+
+def render():
+    st.markdown("""
+    ## Step 1: A Day in Uni Life – Reflecting on Your Wellbeing
+    
+    Meet **Kai**, your friendly wellness companion throughout this journey.  
+    Kai is here to guide you through a typical day in uni life — from waking up to winding down — helping you pause, reflect, and check in with yourself.
+    
+    Together, you’ll explore how you’ve been feeling lately, using a few simple questions based on the Short Warwick-Edinburgh Mental Wellbeing Scale (SWEMWBS).  
+    There are no right or wrong answers — just be honest with yourself.
+    """)
+
+    st.markdown("") 
+    
+    # Likert scale legend
+    st.markdown("""
+    **Rate based on this scale:**
+    😞 1 – None of the time | 😕 2 – Rarely | 😐 3 – Some of the time | 🙂 4 – Often | 😄 5 – All of the time
+    """)
+    st.markdown("---")
+
+    questions = [
+        {
+            "scene": "🌅 Scene 1: Morning Routine in Dorm",
+            "desc": "Kai:\n\"Another busy day ahead! But let's take a moment first… Have you been feeling optimistic about how things are going in life and studies?\""
+        },
+        {
+            "scene": "📚 Scene 2: Rushing to Lecture",
+            "desc": "Kai:\n\"Campus life is hectic — but have you felt useful or like your contributions matter, whether in class, clubs, or helping friends?\""
+        },
+        {
+            "scene": "🖥️ Scene 3: Group Project Work",
+            "desc": "Kai:\n\"When faced with choices — like how to manage your group or schedule — have you felt confident making decisions?\""
+        },
+        {
+            "scene": "🍛 Scene 4: Cafeteria Chat with Friends",
+            "desc": "Kai:\n\"Social moments can be comforting. Lately, have you felt relaxed, even in social or academic settings?\""
+        },
+        {
+            "scene": "🏞️ Scene 5: Solo Break Between Classes",
+            "desc": "Kai:\n\"Let’s be real — uni can be draining. But how have you felt about yourself overall? Have you been feeling useful?\""
+        },
+        {
+            "scene": "🧑‍🤝‍🧑 Scene 6: Club Meeting or Society Hangout",
+            "desc": "Kai:\n\"Whether with flatmates, classmates, or society friends — have you felt close or connected to others lately?\""
+        },
+        {
+            "scene": "🌌 Scene 7: Evening Study or Journaling",
+            "desc": "Kai:\n\"At the end of the day — when thinking through assignments or your own thoughts — have you felt clear-headed?\""
+        }
+    ]
+
+    if "swemwbs_responses" not in st.session_state:
+        st.session_state.swemwbs_responses = [3] * 7  # Default mid-score
+
+    total_score = 0
+    for i, q in enumerate(questions):
+        st.markdown(f"#### {q['scene']}")
+        st.markdown(q["desc"])
+        response = st.slider(
+            f"Q{i+1}", 1, 5, st.session_state.swemwbs_responses[i],
+            format="%d", key=f"q{i+1}", label_visibility="collapsed"
+        )
+        st.session_state.swemwbs_responses[i] = response
+        total_score += response
+        st.markdown("---") 
+
+    st.markdown("")
+
+    # Initialize snapshot state if not yet set
+    if "show_snapshot" not in st.session_state:
+        st.session_state.show_snapshot = False
+    
+    if st.button("📊 Show My Wellbeing Snapshot"):
+        st.session_state.show_snapshot = True
+
+        # Save visit immediately when snapshot is first shown
+        user_id = current_user_id()
+        save_self_check_visit(user_id, total_score, risk_level(total_score))
+    
+    if st.session_state.show_snapshot:
+        st.markdown("### 📊 Step 2: Your Wellbeing Snapshot")
+        st.markdown(f"**Your Total Score:** {total_score} / 35")
+    
+        # Scoring explanation
+        with st.expander("ℹ️ How This Works"):
+            st.markdown("""
+            Each question is scored from 1 to 5:
+            - 😢 None of the time → 1 point  
+            - 😄 All of the time → 5 points
+    
+            **Total possible score: 7–35**
+    
+            - 🔴 Score ≤ 21 → High-Risk Pathway  
+            - 🟢 Score > 21 → Low-Risk Pathway
+            """)    
+            
+        # Show result and navigation buttons
+        if risk_level(total_score) == "High":
+            st.markdown("🔴 **High-Risk Pathway**")
+            st.warning("You might benefit from additional support. Let’s explore some helpful resources together.")
+            if st.button("🔍 View Supportive Resources"):
+                st.session_state.page = "high_risk_pathway"
+                st.rerun()
+        else:
+            st.markdown("🟢 **Low-Risk Pathway**")
+            st.success("Great! You’re showing strong signs of wellbeing. Let’s keep the momentum going.")
+            if st.button("➡️ Continue"):
+                st.session_state.page = "low_risk_pathway"
+                st.rerun()